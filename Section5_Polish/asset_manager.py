@@ -0,0 +1,150 @@
+"""
+Asset Manager Class
+
+Loads images, sounds and fonts once and shares them across the process.
+
+- Paths are resolved relative to this folder, not the current working
+  directory, so the game can be launched from anywhere.
+- Every asset is cached by key and loaded lazily the first time it's asked for.
+- Transformed images (flips, scales) are derived from the cached original
+  instead of loading the file again.
+- shared_assets is a process-wide manager so many Game / Ball instances
+  reuse the same surfaces and sounds.
+- preload() decodes files on a background thread pool; poll() (main thread)
+  moves finished ones into the cache, and asking for an asset that's still
+  loading simply waits for it.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class AssetManager:
+    def __init__(self, base_dir=BASE_DIR):
+        self.base_dir = base_dir
+        self.images = {}
+        self.sounds = {}
+        self.fonts = {}
+
+        # == Background Loading ==
+        self.pending = {}      # ("image" | "sound", name) -> Future
+        self.executor = None
+
+    def path(self, name):
+        return os.path.normpath(os.path.join(self.base_dir, name))
+
+    # == Images ==
+    def image(self, name, flip_x=False, flip_y=False, scale=None):
+        key = (name, flip_x, flip_y, scale)
+        surface = self.images.get(key)
+        if surface is not None:
+            return surface
+
+        if key == (name, False, False, None):
+            if ("image", name) in self.pending:
+                return self.finish(("image", name))
+            surface = self.prepare_image(pygame.image.load(self.path(name)))
+        else:
+            # Derive from the cached original rather than reloading the file
+            surface = self.image(name)
+            if flip_x or flip_y:
+                surface = pygame.transform.flip(surface, flip_x, flip_y)
+            if scale is not None:
+                surface = pygame.transform.smoothscale(surface, scale)
+
+        self.images[key] = surface
+        return surface
+
+    def prepare_image(self, surface):
+        # convert_alpha needs a display; headless tools keep the raw surface
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    # == Audio ==
+    def sound(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            if ("sound", name) in self.pending:
+                return self.finish(("sound", name))
+            sound = pygame.mixer.Sound(self.path(name))
+            self.sounds[name] = sound
+        return sound
+
+    # == Fonts ==
+    def font(self, name, size):
+        # name=None is pygame's default font
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(None if name is None else self.path(name), size)
+            self.fonts[key] = font
+        return font
+
+    # == Background Loading ==
+    def preload(self, images=(), sounds=(), workers=4):
+        """Start decoding files on worker threads and return a Preload to track progress."""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+
+        keys = []
+        for name in images:
+            key = ("image", name)
+            if (name, False, False, None) not in self.images and key not in self.pending:
+                self.pending[key] = self.executor.submit(pygame.image.load, self.path(name))
+            keys.append(key)
+        for name in sounds:
+            key = ("sound", name)
+            if name not in self.sounds and key not in self.pending:
+                self.pending[key] = self.executor.submit(pygame.mixer.Sound, self.path(name))
+            keys.append(key)
+        return Preload(self, keys)
+
+    def finish(self, key):
+        # Wait for a pending load and store it; errors surface here, on first use
+        kind, name = key
+        result = self.pending[key].result()
+        del self.pending[key]
+
+        if kind == "image":
+            result = self.prepare_image(result)
+            self.images[(name, False, False, None)] = result
+        else:
+            self.sounds[name] = result
+        return result
+
+    def poll(self):
+        # Call once per frame on the main thread to collect finished loads
+        for key, future in list(self.pending.items()):
+            if future.done() and future.exception() is None:
+                self.finish(key)
+
+    def is_loaded(self, key):
+        future = self.pending.get(key)
+        return future is None or future.done()
+
+    def clear(self):
+        self.images.clear()
+        self.sounds.clear()
+        self.fonts.clear()
+
+class Preload:
+    """Progress of one group of assets started with AssetManager.preload()."""
+    def __init__(self, manager, keys):
+        self.manager = manager
+        self.keys = keys
+
+    @property
+    def progress(self):
+        if not self.keys:
+            return 1.0
+        loaded = sum(1 for key in self.keys if self.manager.is_loaded(key))
+        return loaded / len(self.keys)
+
+    @property
+    def ready(self):
+        return all(self.manager.is_loaded(key) for key in self.keys)
+
+shared_assets = AssetManager()
@@ -0,0 +1,158 @@
+"""
+Audio Service
+
+Plays sound effects for match events without touching the mixer during physics.
+
+- The engine only emits events. Game queues the ones with a sound here, and
+  the main loop calls flush() once per frame, after the physics ticks, which
+  is the only place sounds actually start.
+- Every sound category (paddle/wall hits, scoring) owns a fixed pool of
+  reserved mixer channels, so a burst of hits can never take the channels
+  the scoring sounds need, and vice versa.
+- Identical events queued within one frame are played once (ten balls
+  hitting walls in the same frame sound like one hit, not ten stacked).
+- At most MAX_VOICES_PER_SOUND copies of a sound play at once; past that, or
+  when every channel in the pool is busy, the oldest voice is cut off and
+  reused instead of queueing up behind it.
+- With no mixer (headless tools, a machine without audio) flush() only
+  clears the queue.
+
+MusicPlayer streams background music through pygame.mixer.music, so only a
+small decode buffer is ever resident (a fully decoded pygame.mixer.Sound of
+a three-minute track is ~30 MB of PCM) and any format SDL_mixer streams
+works (.ogg, .mp3, .wav, ...). Changing tracks fades the old one out and the
+new one in; pygame has a single music stream, so the two fades run back
+to back rather than overlapping. A missing track is skipped with a warning.
+"""
+
+import time
+import pygame
+
+SOUND_FILES = {
+    "lose_point": "assets/lose_point.wav",
+    "win_point": "assets/win_point.wav",
+    "paddle_hit": "assets/paddle_hit.wav",
+    "wall_hit": "assets/wall_hit.wav",
+}
+SOUND_CATEGORIES = {
+    "paddle_hit": "hits",
+    "wall_hit": "hits",
+    "lose_point": "score",
+    "win_point": "score",
+}
+CHANNEL_POOLS = {"hits": 4, "score": 2}   # Reserved channels per category
+MAX_VOICES_PER_SOUND = 2
+MUSIC_FADE_MS = 800
+MUSIC_VOLUME = 1.0
+
+class AudioService:
+    def __init__(self, assets, sound_files=SOUND_FILES, categories=SOUND_CATEGORIES, pools=CHANNEL_POOLS):
+        self.assets = assets
+        self.sound_files = sound_files
+        self.categories = categories
+        self.pool_sizes = pools
+        self.pools = None     # Category -> [Channel], created on the first flush with a mixer
+        self.started = {}     # Channel -> perf_counter time its current sound started
+        self.queue = []       # Events waiting for the next flush, in order, without repeats
+
+        # == Stats ==
+        self.played = 0
+        self.merged = 0       # Duplicate events dropped within a frame
+        self.stolen = 0       # Voices cut off to make room
+
+    def play(self, event):
+        """Queue an event's sound for the next flush (safe to call from physics)."""
+        if event not in self.sound_files:
+            return
+        if event in self.queue:
+            self.merged += 1
+        else:
+            self.queue.append(event)
+
+    def flush(self):
+        """Start every queued sound; call once per frame, outside the physics ticks."""
+        if not self.queue:
+            return
+        events, self.queue = self.queue, []
+        if not pygame.mixer.get_init():
+            return
+        if self.pools is None:
+            self.reserve_channels()
+        for event in events:
+            self.start(event)
+
+    def reserve_channels(self):
+        # Reserved channels are skipped by pygame's own find_channel, so nothing else can take them
+        reserved = sum(self.pool_sizes.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved + 2))
+        pygame.mixer.set_reserved(reserved)
+        self.pools = {}
+        first = 0
+        for category, size in self.pool_sizes.items():
+            self.pools[category] = [pygame.mixer.Channel(index) for index in range(first, first + size)]
+            first += size
+
+    def start(self, event):
+        sound = self.assets.sound(self.sound_files[event])
+        channel = self.pick_channel(self.pools[self.categories[event]], sound)
+        channel.play(sound)
+        self.started[channel] = time.perf_counter()
+        self.played += 1
+
+    def pick_channel(self, pool, sound):
+        busy = [channel for channel in pool if channel.get_busy()]
+        same = [channel for channel in busy if channel.get_sound() == sound]
+        if len(same) >= MAX_VOICES_PER_SOUND:
+            candidates = same
+        else:
+            idle = [channel for channel in pool if not channel.get_busy()]
+            if idle:
+                return idle[0]
+            candidates = busy
+
+        # Voice stealing: restart the channel that's been playing longest
+        self.stolen += 1
+        return min(candidates, key=lambda channel: self.started.get(channel, 0.0))
+
+
+class MusicPlayer:
+    def __init__(self, assets, fade_ms=MUSIC_FADE_MS, volume=MUSIC_VOLUME):
+        self.assets = assets
+        self.fade_ms = fade_ms
+        self.volume = volume
+        self.current = None   # Track playing or fading in (None = silence)
+        self.wanted = None    # Track to switch to once the fade-out finishes
+        self.fading_out = False
+        self.missing = set()  # Tracks that failed to load, so we only warn once
+
+    def play(self, track):
+        """Fade over to track (a file name, or None for silence)."""
+        if not pygame.mixer.get_init():
+            return
+        self.wanted = track
+        if self.fading_out or track == self.current:
+            return
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(self.fade_ms)
+            self.fading_out = True
+        else:
+            self.start(track)
+
+    def update(self):
+        # Start the next track once the old one has faded out; call once per frame
+        if self.fading_out and not pygame.mixer.music.get_busy():
+            self.fading_out = False
+            self.start(self.wanted)
+
+    def start(self, track):
+        self.current = track
+        if track is None or track in self.missing:
+            return
+        try:
+            pygame.mixer.music.load(self.assets.path(track))
+        except pygame.error as error:
+            print(f"Music {track} not loaded: {error}")
+            self.missing.add(track)
+            return
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops=-1, fade_ms=self.fade_ms)
@@ -0,0 +1,204 @@
+"""
+Ball Pool Class
+
+Struct-of-arrays storage for the extra balls in multi-ball ("chaos") mode.
+
+- Positions and speeds live in flat array("i") columns, one slot per ball,
+  instead of one heavyweight object per ball.
+- Slots are recycled through a free list, so nothing is allocated during play.
+- Balls spawn on the centre line at a random height, angle and speed, and
+  don't all arrive at once: the serve staggers them over SERVE_STAGGER
+  ticks, and a ball that scores waits RESPAWN_DELAY ticks (in its own slot)
+  before coming back.
+- Balls are addressed by slot index; there are no per-ball objects at all.
+- step() moves every live ball, bounces it off walls and paddles, and
+  handles scoring in a single batched pass with the same rules as BallBody.
+- resolve_contacts() uses a SpatialHash to find ball–obstacle and ball–ball
+  contacts without testing every pair.
+"""
+
+from array import array
+from collision import bounce_out
+
+SERVE_STAGGER = 120            # Ticks the serve spreads the extra balls over
+RESPAWN_DELAY = (30, 120)      # Min / max ticks before a scored ball comes back
+
+class BallPool:
+    def __init__(self, capacity, size, screen_size):
+        self.capacity = capacity
+        self.width, self.height = size
+        self.screen_width, self.screen_height = screen_size
+
+        # == Columns ==
+        self.x = array("i", bytes(4 * capacity))
+        self.y = array("i", bytes(4 * capacity))
+        self.x_speed = array("i", bytes(4 * capacity))
+        self.y_speed = array("i", bytes(4 * capacity))
+        self.previous_x = array("i", bytes(4 * capacity))
+        self.previous_y = array("i", bytes(4 * capacity))
+        self.alive = bytearray(capacity)
+        self.respawn = array("i", bytes(4 * capacity))   # Ticks until a waiting slot spawns, 0 = not waiting
+
+        # == Slots ==
+        self.free = list(range(capacity - 1, -1, -1))   # Pop from the end = lowest slot first
+        self.count = 0
+
+    def place_random(self, index, speed, rng):
+        # Centre line, random height, random angle and pace (never flat, never faster than speed)
+        self.x[index] = self.previous_x[index] = self.screen_width // 2 - self.width // 2
+        self.y[index] = self.previous_y[index] = rng.randint(0, self.screen_height - self.height)
+        self.x_speed[index] = rng.randint(max(1, speed // 2), speed) * rng.choice((-1, 1))
+        self.y_speed[index] = rng.randint(1, speed) * rng.choice((-1, 1))
+        self.respawn[index] = 0
+        self.alive[index] = 1
+
+    def schedule(self, count, rng, max_delay=SERVE_STAGGER):
+        """Reserve count free slots that spawn at random within max_delay ticks."""
+        for _ in range(min(count, len(self.free))):
+            index = self.free.pop()
+            self.respawn[index] = rng.randint(1, max_delay)
+            self.count += 1
+
+    def release(self, index):
+        if self.alive[index] or self.respawn[index]:
+            self.alive[index] = 0
+            self.respawn[index] = 0
+            self.free.append(index)
+            self.count -= 1
+
+    def clear(self):
+        for index in range(self.capacity):
+            self.release(index)
+
+    def interpolated_positions(self, alpha):
+        # Yields top-left (x, y) of every live ball, blended like Body.interpolated_topleft
+        x, y, previous_x, previous_y, alive = self.x, self.y, self.previous_x, self.previous_y, self.alive
+        for index in range(self.capacity):
+            if alive[index]:
+                yield (
+                    round(previous_x[index] + (x[index] - previous_x[index]) * alpha),
+                    round(previous_y[index] + (y[index] - previous_y[index]) * alpha)
+                )
+
+    def step(self, player_rect, opponent_rect, speed, rng):
+        """Advance every live ball one tick.
+
+        Returns (wall hits, paddle hits, goals). Balls that score wait in
+        their slot and respawn RESPAWN_DELAY ticks later; waiting slots
+        whose timer runs out spawn this tick.
+        """
+        x, y, x_speed, y_speed, alive, respawn = self.x, self.y, self.x_speed, self.y_speed, self.alive, self.respawn
+        width, height = self.width, self.height
+        bottom_limit = self.screen_height - height
+        screen_width = self.screen_width
+
+        # Paddle bounds pulled out once for the whole pass
+        player_left, player_right = player_rect.left, player_rect.right
+        player_top, player_bottom = player_rect.top, player_rect.bottom
+        opponent_left, opponent_right = opponent_rect.left, opponent_rect.right
+        opponent_top, opponent_bottom = opponent_rect.top, opponent_rect.bottom
+
+        wall_hits = paddle_hits = goals = 0
+        self.previous_x[:] = x
+        self.previous_y[:] = y
+
+        for index in range(self.capacity):
+            if not alive[index]:
+                if respawn[index]:
+                    respawn[index] -= 1
+                    if not respawn[index]:
+                        self.place_random(index, speed, rng)
+                continue
+
+            # == Movement ==
+            ball_x = x[index] + x_speed[index]
+            ball_y = y[index] + y_speed[index]
+
+            # == Walls ==
+            if ball_y <= 0:
+                ball_y = 0
+                y_speed[index] = -y_speed[index]
+                wall_hits += 1
+            if ball_y >= bottom_limit:
+                ball_y = bottom_limit
+                y_speed[index] = -y_speed[index]
+                wall_hits += 1
+
+            # == Paddles (same strict overlap test as colliderect) ==
+            ball_right = ball_x + width
+            ball_bottom = ball_y + height
+            if ball_x < player_right and player_left < ball_right and ball_y < player_bottom and player_top < ball_bottom:
+                x_speed[index] = -x_speed[index]
+                paddle_hits += 1
+            if ball_x < opponent_right and opponent_left < ball_right and ball_y < opponent_bottom and opponent_top < ball_bottom:
+                x_speed[index] = -x_speed[index]
+                paddle_hits += 1
+
+            # == Scoring ==
+            if ball_x < 0 or ball_right > screen_width:
+                goals += 1
+                alive[index] = 0
+                respawn[index] = rng.randint(*RESPAWN_DELAY)   # Keeps the slot while it waits
+                continue
+
+            x[index] = ball_x
+            y[index] = ball_y
+
+        return wall_hits, paddle_hits, goals
+
+    def resolve_contacts(self, grid, obstacles, ball_collisions):
+        """Bounce balls off obstacles (grid ids -1, -2, ...) and optionally each other.
+
+        Obstacles must already be in the grid; live balls are kept in it under
+        their slot index. Returns (obstacle hits, ball hits).
+        """
+        x, y, x_speed, y_speed, alive = self.x, self.y, self.x_speed, self.y_speed, self.alive
+        width, height = self.width, self.height
+
+        # == Sync Grid ==
+        for index in range(self.capacity):
+            if alive[index]:
+                rect = (x[index], y[index], width, height)
+                if index in grid:
+                    grid.update(index, rect)
+                else:
+                    grid.insert(index, rect)
+            elif index in grid:
+                grid.remove(index)
+
+        obstacle_hits = ball_hits = 0
+        for a, b in sorted(grid.pairs()):
+            if b < 0:
+                continue   # Two obstacles
+            if a < 0:
+                # Ball b against obstacle a
+                x[b], y[b], x_speed[b], y_speed[b] = bounce_out(
+                    x[b], y[b], width, height, x_speed[b], y_speed[b], obstacles[-1 - a]
+                )
+                obstacle_hits += 1
+            elif ball_collisions:
+                # Equal-mass elastic bounce: swap velocities if moving towards each other
+                closing_x = (x[b] - x[a]) * (x_speed[a] - x_speed[b])
+                closing_y = (y[b] - y[a]) * (y_speed[a] - y_speed[b])
+                if closing_x + closing_y > 0:
+                    x_speed[a], x_speed[b] = x_speed[b], x_speed[a]
+                    y_speed[a], y_speed[b] = y_speed[b], y_speed[a]
+                    ball_hits += 1
+        return obstacle_hits, ball_hits
+
+    def snapshot(self):
+        return (tuple(self.x), tuple(self.y), tuple(self.x_speed), tuple(self.y_speed),
+                bytes(self.alive), tuple(self.respawn), tuple(self.free))
+
+    def restore(self, snapshot):
+        xs, ys, x_speeds, y_speeds, alive, respawn, free = snapshot
+        self.x[:] = array("i", xs)
+        self.y[:] = array("i", ys)
+        self.x_speed[:] = array("i", x_speeds)
+        self.y_speed[:] = array("i", y_speeds)
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+        self.alive[:] = alive
+        self.respawn[:] = array("i", respawn)
+        self.free = list(free)
+        self.count = self.capacity - len(self.free)
@@ -0,0 +1,171 @@
+"""
+BatchPong Class
+
+Runs N independent Pong matches at once with NumPy.
+
+- Same rules as engine.py (BallBody.move / check_collisions, OpponentBody.update,
+  scoring and first-to-N), but every field is an array with one entry per match.
+- A single step() advances all matches with vectorized operations: wall bounces,
+  paddle AABB checks, CPU paddle movement, scoring and resets.
+- Ball speed and CPU paddle speed can differ per match, which makes parameter
+  sweeps over the keys 3–8 knobs a single batch run.
+- Uses hardcoded 1280x720 bounds, the same as the rest of the tutorial.
+
+Unlike the interactive game, a ball that leaves the screen is served again
+straight away (auto_serve) since there is nobody to press SPACE.
+"""
+
+import numpy as np
+from engine import SCREEN_WIDTH, SCREEN_HEIGHT, BALL_SIZE, PADDLE_SIZE
+
+class BatchPong:
+    def __init__(self, num_matches, ball_speed=8, opponent_speed=10, player_speed=10,
+                 win_score=3, auto_serve=True, seed=None,
+                 ball_size=BALL_SIZE, paddle_size=PADDLE_SIZE):
+        self.num_matches = num_matches
+        self.win_score = win_score
+        self.auto_serve = auto_serve
+        self.rng = np.random.default_rng(seed)
+
+        self.ball_width, self.ball_height = ball_size
+        self.paddle_width, self.paddle_height = paddle_size
+
+        # Paddles never move horizontally, so their x is shared by every match
+        self.player_x = 10 - self.paddle_width // 2
+        self.opponent_x = SCREEN_WIDTH - 10 - self.paddle_width // 2
+
+        # == Per-match knobs (scalars or arrays of length num_matches) ==
+        self.ball_speed = self._column(ball_speed)
+        self.opponent_speed = self._column(opponent_speed)
+        self.player_speed = self._column(player_speed)
+
+        self.reset()
+
+    def _column(self, value):
+        return np.broadcast_to(np.asarray(value, dtype=np.int32), (self.num_matches,)).copy()
+
+    def _random_signs(self, count):
+        return self.rng.choice(np.array((-1, 1), dtype=np.int32), size=count)
+
+    def reset(self):
+        n = self.num_matches
+
+        # == Ball ==
+        self.ball_x = np.full(n, SCREEN_WIDTH // 2 - self.ball_width // 2, dtype=np.int32)
+        self.ball_y = np.full(n, SCREEN_HEIGHT // 2 - self.ball_height // 2, dtype=np.int32)
+        self.ball_vx = self.ball_speed * self._random_signs(n)
+        self.ball_vy = self.ball_speed * self._random_signs(n)
+        self.active = np.full(n, self.auto_serve)
+
+        # == Paddles (top edge) ==
+        self.player_y = np.full(n, SCREEN_HEIGHT // 2 - self.paddle_height // 2, dtype=np.int32)
+        self.opponent_y = self.player_y.copy()
+
+        # == Scores ==
+        self.player_score = np.zeros(n, dtype=np.int32)
+        self.opponent_score = np.zeros(n, dtype=np.int32)
+        self.done = np.zeros(n, dtype=bool)
+
+        # == Stats ==
+        self.wall_hits = np.zeros(n, dtype=np.int32)
+        self.paddle_hits = np.zeros(n, dtype=np.int32)
+        self.ticks = 0
+
+    def reset_matches(self, mask):
+        # Same as reset() but only for the matches selected by mask
+        count = int(mask.sum())
+        if count == 0:
+            return
+        self.ball_x[mask] = SCREEN_WIDTH // 2 - self.ball_width // 2
+        self.ball_y[mask] = SCREEN_HEIGHT // 2 - self.ball_height // 2
+        self.ball_vx[mask] = self.ball_speed[mask] * self._random_signs(count)
+        self.ball_vy[mask] = self.ball_speed[mask] * self._random_signs(count)
+        self.active[mask] = self.auto_serve
+        self.player_y[mask] = SCREEN_HEIGHT // 2 - self.paddle_height // 2
+        self.opponent_y[mask] = self.player_y[mask]
+        self.player_score[mask] = 0
+        self.opponent_score[mask] = 0
+        self.done[mask] = False
+        self.wall_hits[mask] = 0
+        self.paddle_hits[mask] = 0
+
+    def serve(self, mask):
+        # Equivalent of BallBody.start() for every match selected by mask
+        count = int(mask.sum())
+        if count == 0:
+            return
+        self.active[mask] = True
+        self.ball_vx[mask] = np.abs(self.ball_vx[mask]) * self._random_signs(count)
+        self.ball_vy[mask] = np.abs(self.ball_vy[mask]) * self._random_signs(count)
+
+    def step(self, player_direction=None):
+        """Advance every unfinished match by one tick.
+
+        player_direction is an optional int array of -1 (up), 0 or 1 (down)
+        per match; by default the player paddle stays still.
+        """
+        live = ~self.done
+        moving = self.active & live
+
+        # == Ball Movement ==
+        self.ball_x += self.ball_vx * moving
+        self.ball_y += self.ball_vy * moving
+
+        # == Wall Collisions ==
+        top = moving & (self.ball_y <= 0)
+        self.ball_y[top] = 0
+        bottom = moving & (self.ball_y + self.ball_height >= SCREEN_HEIGHT)
+        self.ball_y[bottom] = SCREEN_HEIGHT - self.ball_height
+        self.ball_vy = np.where(top ^ bottom, -self.ball_vy, self.ball_vy)
+        self.wall_hits += top
+        self.wall_hits += bottom
+
+        # == Paddle Collisions (AABB) ==
+        in_player_rows = (self.ball_y < self.player_y + self.paddle_height) & (self.player_y < self.ball_y + self.ball_height)
+        in_opponent_rows = (self.ball_y < self.opponent_y + self.paddle_height) & (self.opponent_y < self.ball_y + self.ball_height)
+        hit_player = moving & in_player_rows & (self.ball_x < self.player_x + self.paddle_width) & (self.player_x < self.ball_x + self.ball_width)
+        hit_opponent = moving & in_opponent_rows & (self.ball_x < self.opponent_x + self.paddle_width) & (self.opponent_x < self.ball_x + self.ball_width)
+        self.ball_vx = np.where(hit_player ^ hit_opponent, -self.ball_vx, self.ball_vx)
+        self.paddle_hits += hit_player
+        self.paddle_hits += hit_opponent
+
+        # == Player ==
+        if player_direction is not None:
+            self.player_y += np.sign(player_direction).astype(np.int32) * self.player_speed * live
+            np.clip(self.player_y, 0, SCREEN_HEIGHT - self.paddle_height, out=self.player_y)
+
+        # == Opponent (chases the ball's centre) ==
+        ball_center = self.ball_y + self.ball_height // 2
+        opponent_center = self.opponent_y + self.paddle_height // 2
+        chase = np.sign(ball_center - opponent_center).astype(np.int32)
+        chase *= live & (self.ball_vx != 0)
+        self.opponent_y += chase * self.opponent_speed
+        np.clip(self.opponent_y, 0, SCREEN_HEIGHT - self.paddle_height, out=self.opponent_y)
+
+        # == Scoring ==
+        lose = live & (self.ball_x < 0)
+        win = live & ~lose & (self.ball_x + self.ball_width > SCREEN_WIDTH)
+        self.opponent_score += lose
+        self.player_score += win
+
+        scored = lose | win
+        self.ball_x[scored] = SCREEN_WIDTH // 2 - self.ball_width // 2
+        self.ball_y[scored] = SCREEN_HEIGHT // 2 - self.ball_height // 2
+        self.active[scored] = False
+
+        # == Win Condition ==
+        self.done |= (self.player_score == self.win_score) | (self.opponent_score == self.win_score)
+
+        if self.auto_serve:
+            self.serve(scored & ~self.done)
+
+        self.ticks += 1
+        return scored
+
+    def run(self, max_ticks, player_direction=None):
+        """Step until every match is finished or max_ticks is reached."""
+        for _ in range(max_ticks):
+            if self.done.all():
+                break
+            self.step(player_direction)
+        return self.ticks
@@ -0,0 +1,89 @@
+"""
+Spatial Hash Benchmark
+
+Finds every overlapping pair among N moving 30x30 boxes on the 1280x720 field,
+once with brute-force pygame.Rect.colliderect over all pairs and once with
+SpatialHash (update every box, then pairs()).
+
+Run from the Section5_Polish folder:
+    python benchmarks/bench_spatial_hash.py
+"""
+
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from spatial_hash import SpatialHash
+
+SIZES = (10, 100, 1000)
+TICKS = 60
+BOX_SIZE = 30
+
+def make_boxes(count, rng):
+    boxes = []
+    for _ in range(count):
+        boxes.append([
+            rng.randrange(0, 1280 - BOX_SIZE), rng.randrange(0, 720 - BOX_SIZE),
+            rng.choice((-8, 8)), rng.choice((-8, 8))
+        ])
+    return boxes
+
+def move(boxes):
+    for box in boxes:
+        box[0] += box[2]
+        box[1] += box[3]
+        if box[0] <= 0 or box[0] >= 1280 - BOX_SIZE:
+            box[2] = -box[2]
+        if box[1] <= 0 or box[1] >= 720 - BOX_SIZE:
+            box[3] = -box[3]
+
+def brute_force(boxes):
+    rects = [pygame.Rect(x, y, BOX_SIZE, BOX_SIZE) for x, y, _, _ in boxes]
+    found = set()
+    for a in range(len(rects)):
+        rect_a = rects[a]
+        for b in range(a + 1, len(rects)):
+            if rect_a.colliderect(rects[b]):
+                found.add((a, b))
+    return found
+
+def spatial_hash(boxes, grid):
+    for index, (x, y, _, _) in enumerate(boxes):
+        if index in grid:
+            grid.update(index, (x, y, BOX_SIZE, BOX_SIZE))
+        else:
+            grid.insert(index, (x, y, BOX_SIZE, BOX_SIZE))
+    return grid.pairs()
+
+def run(count):
+    rng = random.Random(count)
+    boxes = make_boxes(count, rng)
+    grid = SpatialHash()
+    brute_time = grid_time = 0.0
+
+    for _ in range(TICKS):
+        move(boxes)
+
+        start = time.perf_counter()
+        expected = brute_force(boxes)
+        brute_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = spatial_hash(boxes, grid)
+        grid_time += time.perf_counter() - start
+
+        if result != expected:
+            raise AssertionError(f"SpatialHash disagrees with colliderect at {count} objects")
+
+    return brute_time / TICKS, grid_time / TICKS
+
+if __name__ == "__main__":
+    print(f"{'objects':>8} {'brute force':>14} {'spatial hash':>14} {'speedup':>8}")
+    for count in SIZES:
+        brute_time, grid_time = run(count)
+        print(f"{count:>8} {brute_time * 1000:>11.3f} ms {grid_time * 1000:>11.3f} ms {brute_time / grid_time:>7.1f}x")
@@ -0,0 +1,234 @@
+"""
+Determinism Checks
+
+Headless checks that the simulation replays bit for bit (SDL dummy video/audio drivers).
+
+- Each check is a function registered with @check; it returns a short
+  detail string and raises CheckFailed when something doesn't match.
+- Matches are driven by scripted, seeded random input, so every run plays
+  the same games.
+- replay: recorded replays (chaos mode, swept collision, predicting CPU)
+  re-simulate to their stored checksum, and twice in a row to the same state.
+- archive: ReplayArchive.seek() lands on exactly the snapshot a sequential
+  run has at that frame, on and between keyframes.
+- viewer: ReplayViewer rebuilds the recorded match config (win_score=7)
+  and every frame it seeks to matches the archive's columns.
+- rollback: two RollbackSessions over a lossy in-memory link confirm the
+  same checksums as a plain Match fed the same inputs.
+
+Run from the Section5_Polish folder:
+    python benchmarks/check_determinism.py                   # every check
+    python benchmarks/check_determinism.py --filter rollback # only checks containing "rollback"
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from engine import Match, Inputs, NO_INPUT
+from replay import ReplayRecorder, ReplayPlayer, snapshot_checksum
+from netplay import RollbackSession, CHECKSUM_HISTORY
+
+TICKS = 3000
+
+CHECKS = {}
+
+class CheckFailed(Exception):
+    pass
+
+def check(name):
+    def register(function):
+        CHECKS[name] = function
+        return function
+    return register
+
+def expect(condition, message):
+    if not condition:
+        raise CheckFailed(message)
+
+# == Scripted Input ==
+def scripted_inputs(rng, match, tick):
+    # Start the match, serve whenever the ball is waiting, otherwise hold a random direction
+    if tick == 0:
+        return Inputs(presses=("2",))
+    presses = ("space",) if not match.ball.active and rng.random() < 0.1 else ()
+    direction = rng.randrange(3)
+    return Inputs(direction == 1, direction == 2, presses)
+
+def record(path, ticks=TICKS, seed=1, **options):
+    """Record a scripted match to path (stops early once someone wins)."""
+    match = Match(seed=seed, **options)
+    recorder = ReplayRecorder(match)
+    rng = random.Random(seed)
+    for tick in range(ticks):
+        recorder.step(scripted_inputs(rng, match, tick))
+        if match.game_state == "game_results":
+            break
+    recorder.save(path)
+    return match
+
+# == Replays ==
+@check("replay")
+def check_replay(folder):
+    configs = (
+        {"extra_balls": 8},
+        {"collision": "swept", "opponent_speed": 14},
+        {"opponent_strategy": "predict", "reaction_delay": 6, "aim_error": 40},
+    )
+    for index, options in enumerate(configs):
+        path = os.path.join(folder, f"replay{index}.pongreplay")
+        recorded = record(path, seed=index + 1, **options)
+        replay = ReplayPlayer.load(path)
+        expect(replay.verify(), f"{options}: replay doesn't reach the recorded checksum")
+        first = replay.match.snapshot()
+        expect(first == recorded.snapshot(), f"{options}: replay ends in a different state than the recording")
+        replay.rewind()
+        expect(replay.run().snapshot() == first, f"{options}: two replays of the same file differ")
+    return f"{len(configs)} configs, {TICKS} ticks max each"
+
+# == Archives ==
+@check("archive")
+def check_archive(folder):
+    from replay_archive import write_archive, ReplayArchive, KEYFRAME_INTERVAL  # Needs NumPy
+
+    replay_path = os.path.join(folder, "archive.pongreplay")
+    archive_path = os.path.join(folder, "archive.pongarchive")
+    record(replay_path, collision="swept")
+    replay = ReplayPlayer.load(replay_path)
+    write_archive(replay, archive_path)
+    archive = ReplayArchive(archive_path)
+
+    # State at every frame from one sequential run
+    replay.rewind()
+    expected = [replay.match.snapshot()]
+    while replay.step():
+        expected.append(replay.match.snapshot())
+    expect(len(expected) == len(archive), f"archive has {len(archive)} frames, replay {len(expected)}")
+
+    frames = sorted(set(range(0, len(archive), 37))
+                    | set(range(0, len(archive), KEYFRAME_INTERVAL))
+                    | {len(archive) - 1})
+    match = archive.new_match()
+    for frame in reversed(frames):   # Backwards, so every seek has to jump
+        archive.seek(match, frame)
+        expect(match.snapshot() == expected[frame], f"seek({frame}) differs from the sequential run")
+    return f"{len(frames)} frames of {len(archive)}"
+
+@check("viewer")
+def check_viewer(folder):
+    import pygame
+    from replay_archive import archive_replay_file, ReplayViewer
+    from game import Game
+
+    replay_path = os.path.join(folder, "viewer.pongreplay")
+    archive_path = os.path.join(folder, "viewer.pongarchive")
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+    record(replay_path, ticks=20000, win_score=7)
+    archive = archive_replay_file(replay_path, archive_path)
+
+    viewer = ReplayViewer(Game(preload=False), archive)
+    match = viewer.game.match
+    expect(match.win_score == 7, f"viewer plays to {match.win_score}, the recording to 7")
+    frames = list(range(0, len(archive), max(1, len(archive) // 60))) + [len(archive) - 1]
+    for frame in frames:
+        viewer.seek(frame)
+        state = (match.ball.rect.x, match.ball.rect.y, match.player_score, match.opponent_score)
+        stored = tuple(int(archive[name][frame]) for name in ("ball_x", "ball_y", "player_score", "opponent_score"))
+        expect(state == stored, f"frame {frame}: viewer shows {state}, archive has {stored}")
+    expect(match.game_state == "game_results", f"last frame is {match.game_state}, not game_results")
+    pygame.quit()
+    return f"{len(frames)} frames, final score {match.player_score}-{match.opponent_score}"
+
+# == Netplay ==
+class LoopbackLink:
+    """In-memory transport: packets arrive after latency steps, some are dropped."""
+    def __init__(self, clock, latency, loss, rng):
+        self.clock = clock        # One-item list: the current step, shared by both ends
+        self.latency = latency
+        self.loss = loss
+        self.rng = rng
+        self.peer = None
+        self.inbox = []           # (arrival step, data)
+
+    def send(self, data):
+        if self.rng.random() >= self.loss:
+            delay = self.latency + self.rng.randrange(3)
+            self.peer.inbox.append((self.clock[0] + delay, data))
+
+    def receive(self):
+        arrived = [data for step, data in self.inbox if step <= self.clock[0]]
+        self.inbox = [(step, data) for step, data in self.inbox if step > self.clock[0]]
+        return arrived
+
+    def close(self):
+        pass
+
+@check("rollback")
+def check_rollback(folder):
+    rng = random.Random(7)
+    clock = [0]
+    left_link = LoopbackLink(clock, latency=8, loss=0.1, rng=rng)
+    right_link = LoopbackLink(clock, latency=8, loss=0.1, rng=rng)
+    left_link.peer, right_link.peer = right_link, left_link
+    sessions = {
+        "left": RollbackSession(Match(seed=3, opponent_strategy="remote"), "left", left_link),
+        "right": RollbackSession(Match(seed=3, opponent_strategy="remote"), "right", right_link),
+    }
+
+    # Inputs each side actually scheduled, by the tick they apply to
+    scheduled = {side: {tick: NO_INPUT for tick in range(session.input_delay)} for side, session in sessions.items()}
+    input_rngs = {"left": random.Random(1), "right": random.Random(2)}
+    while min(session.tick for session in sessions.values()) < TICKS:
+        for side, session in sessions.items():
+            tick = session.tick
+            inputs = scripted_inputs(input_rngs[side], session.match, tick)
+            if side == "right" and tick == 0:
+                inputs = NO_INPUT   # Only one side needs to start the match
+            if session.step(inputs):
+                scheduled[side][tick + session.input_delay] = inputs
+        clock[0] += 1
+
+    left, right = sessions["left"], sessions["right"]
+    common = sorted(set(left.confirmed_checksums) & set(right.confirmed_checksums))
+    expect(len(common) > CHECKSUM_HISTORY // 2, f"only {len(common)} ticks confirmed by both peers")
+    expect(left.rollbacks > 0, "the lossy link never caused a rollback")
+
+    # Reference: one Match fed both peers' inputs directly
+    reference = Match(seed=3, opponent_strategy="remote")
+    for tick in range(common[-1] + 1):
+        if tick in left.confirmed_checksums or tick in right.confirmed_checksums:
+            checksum = snapshot_checksum(reference.snapshot())
+            for side, session in sessions.items():
+                confirmed = session.confirmed_checksums.get(tick, checksum)
+                expect(confirmed == checksum, f"{side} desynced at tick {tick}")
+        reference.step(scheduled["left"][tick], scheduled["right"][tick])
+    return f"{len(common)} ticks compared, {left.rollbacks + right.rollbacks} rollbacks, {left.stalls + right.stalls} stalls"
+
+# == Running ==
+def main():
+    parser = argparse.ArgumentParser(description="Headless determinism checks")
+    parser.add_argument("--filter", default="", help="Only run checks whose name contains this")
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as folder:
+        for name, function in CHECKS.items():
+            if args.filter not in name:
+                continue
+            try:
+                print(f"ok    {name:<10} {function(folder)}")
+            except CheckFailed as error:
+                print(f"FAIL  {name:<10} {error}")
+                failures += 1
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
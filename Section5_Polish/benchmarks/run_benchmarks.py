@@ -0,0 +1,316 @@
+"""
+Benchmark Suite
+
+Times the game loop and its subsystems headless (SDL dummy video/audio drivers).
+
+- Each benchmark is a setup function registered with @benchmark; it builds
+  whatever it needs and returns the operation to time.
+- ops/sec is the best of ROUNDS rounds, so one noisy round doesn't count.
+- Allocations are measured in a separate pass: the mean tracemalloc peak
+  of one operation (Python heap only; SDL surface pixels aren't traced) and
+  net memory blocks left behind per operation (sys.getallocatedblocks),
+  which catches leaks and growing caches.
+- Speeds are also stored relative to a fixed pure-Python reference op,
+  timed in rounds interleaved with each benchmark's own, so a slower or
+  momentarily busier machine shifts the reference along with the benchmark.
+- Results are compared against baseline.json; a benchmark whose relative
+  speed is more than --threshold lower (or that allocates that much more)
+  is a regression and the script exits with status 1.
+- baseline.json is machine-specific and not committed: the first run on a
+  machine (e.g. the CI host) saves one and passes.
+
+Run from the Section5_Polish folder:
+    python benchmarks/run_benchmarks.py                  # compare against the baseline
+    python benchmarks/run_benchmarks.py --save-baseline  # accept the current numbers
+    python benchmarks/run_benchmarks.py --filter draw    # only benchmarks containing "draw"
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from engine import Match, Inputs, NO_INPUT
+from asset_manager import AssetManager
+from text_cache import TextCache
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+ROUNDS = 7
+MIN_ROUND_TIME = 0.2   # Seconds; the op count per round is scaled up to at least this
+THRESHOLD = 0.35       # Calibrated so repeated runs of an unchanged tree pass
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def started_match(**options):
+    match = Match(seed=1, **options)
+    match.step(Inputs(presses=("2", "space")))
+    return match
+
+def new_game(state="menu"):
+    from game import Game
+    game = Game(preload=False, seed=1)
+    if state in ("game", "game_results"):
+        game.update([pygame.event.Event(pygame.KEYDOWN, key=pygame.K_2)])
+        game.update([pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)])
+    if state == "game_results":
+        game.match.player_score = game.match.win_score
+        game.match.step()
+    return game
+
+# == Engine ==
+@benchmark("ball_update")
+def ball_update():
+    match = started_match()
+    ball, player, opponent, emit = match.ball, match.player, match.opponent, match.emit
+
+    def op():
+        ball.update(player, opponent, emit)
+        if not 0 <= ball.rect.x <= 1250:
+            ball.reset()
+            ball.start()
+    return op
+
+@benchmark("ball_update_swept")
+def ball_update_swept():
+    match = started_match(collision="swept")
+    ball, player, opponent, emit = match.ball, match.player, match.opponent, match.emit
+
+    def op():
+        ball.update(player, opponent, emit)
+        if not 0 <= ball.rect.x <= 1250:
+            ball.reset()
+            ball.start()
+    return op
+
+@benchmark("opponent_update")
+def opponent_update():
+    match = started_match()
+    return lambda: match.opponent.update(match.ball)
+
+@benchmark("opponent_update_predict")
+def opponent_update_predict():
+    match = started_match(opponent_strategy="predict", reaction_delay=6, aim_error=40)
+    opponent, ball = match.opponent, match.ball
+
+    def op():
+        opponent.replan = True
+        opponent.update(ball)
+    return op
+
+@benchmark("match_step")
+def match_step():
+    match = started_match()
+    serve = Inputs(presses=("space",))
+
+    def op():
+        match.step(NO_INPUT if match.ball.active else serve)
+        if match.game_state != "game":
+            match.step(Inputs(presses=("1", "2")))
+    return op
+
+# == Game Frontend ==
+@benchmark("game_update")
+def game_update():
+    game = new_game("game")
+    serve = [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+
+    def op():
+        game.update(serve if not game.match.ball.active else [])
+        if game.match.game_state != "game":
+            game.match.return_to_menu()
+            game.match.start_game()
+    return op
+
+def draw_benchmark(state):
+    def setup():
+        screen = pygame.display.get_surface()
+        game = new_game(state)
+        return lambda: game.draw(screen, 0.5)
+    return setup
+
+for _state in ("menu", "game", "game_results"):
+    benchmark(f"game_draw_{_state}")(draw_benchmark(_state))
+
+# == Text ==
+@benchmark("text_render_uncached")
+def text_render_uncached():
+    font = pygame.font.Font(None, 28)
+    return lambda: font.render("CPU: 10   Player: 10   Ball: X:8/Y:8", True, (185, 185, 185))
+
+@benchmark("text_render_cached")
+def text_render_cached():
+    font = pygame.font.Font(None, 28)
+    cache = TextCache()
+    return lambda: cache.render(font, "CPU: 10   Player: 10   Ball: X:8/Y:8", (185, 185, 185))
+
+# == Startup ==
+@benchmark("startup_game_instance")
+def startup_game_instance():
+    # A fresh AssetManager every time, so images and fonts are loaded from disk
+    from game import Game
+    return lambda: Game(assets=AssetManager(), preload=False, seed=1)
+
+@benchmark("startup_match_instance")
+def startup_match_instance():
+    return lambda: Match(seed=1)
+
+# == Measurement ==
+def reference_op():
+    # Fixed interpreter workload the other speeds are divided by
+    total = 0
+    for value in range(100):
+        total += value * value
+    return total
+
+def calibrate(op):
+    # An op count that takes at least MIN_ROUND_TIME
+    count = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(count):
+            op()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_ROUND_TIME:
+            return count
+        count *= 2 if elapsed < MIN_ROUND_TIME / 10 else 1 + round(MIN_ROUND_TIME / max(elapsed, 1e-9))
+
+def time_round(op, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        op()
+    return time.perf_counter() - start
+
+def measure_speed(op):
+    """Best-of-ROUNDS ops/sec for op and for reference_op, with their rounds interleaved."""
+    count = calibrate(op)
+    reference_count = calibrate(reference_op)
+    best = reference_best = float("inf")
+    for _ in range(ROUNDS):
+        best = min(best, time_round(op, count))
+        reference_best = min(reference_best, time_round(reference_op, reference_count))
+    return count / best, reference_count / reference_best, count
+
+def measure_allocations(op, count):
+    count = max(1, min(count, 2000))
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(count):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        op()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - before
+    tracemalloc.stop()
+    gc.collect()
+    blocks_after = sys.getallocatedblocks()
+    return peak_total / 1024 / count, (blocks_after - blocks_before) / count
+
+def run(names):
+    results = {}
+    for name in names:
+        op = BENCHMARKS[name]()
+        op()   # Warm-up (lazy loads, caches)
+        ops_per_sec, reference_per_sec, count = measure_speed(op)
+        peak_kb, blocks = measure_allocations(op, count)
+        results[name] = {
+            "ops_per_sec": ops_per_sec, "relative": ops_per_sec / reference_per_sec,
+            "peak_kb_per_op": peak_kb, "blocks_per_op": blocks,
+        }
+    return results
+
+def memory_per_game():
+    # Bytes retained by one extra Game, with shared assets already loaded
+    from game import Game
+    games = [Game(preload=False, seed=1)]
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    games.append(Game(preload=False, seed=2))
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return after - before
+
+# == Baseline ==
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        baseline = json.load(file)
+    # Baselines from before relative speeds were stored can't be compared fairly
+    return {name: result for name, result in baseline.items() if "relative" in result}
+
+def regressions(results, baseline, threshold):
+    found = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result["relative"] < base["relative"] * (1 - threshold):
+            found.append(f"{name}: {result['relative'] / base['relative'] - 1:+.0%} relative to the reference op "
+                         f"({result['ops_per_sec']:,.0f} ops/s, baseline {base['ops_per_sec']:,.0f})")
+        # A fraction of a block per op is noise; whole extra blocks per op are a leak or new garbage
+        if result["blocks_per_op"] > base["blocks_per_op"] * (1 + threshold) + 1:
+            found.append(f"{name}: {result['blocks_per_op']:.1f} blocks/op vs baseline {base['blocks_per_op']:.1f}")
+    return found
+
+def print_results(results, baseline):
+    print(f"{'benchmark':<26} {'ops/sec':>13} {'vs base':>8} {'peak KB/op':>11} {'blocks/op':>10}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = f"{result['relative'] / base['relative'] - 1:+.0%}" if base else "new"
+        print(f"{name:<26} {result['ops_per_sec']:>13,.0f} {change:>8} "
+              f"{result['peak_kb_per_op']:>11.2f} {result['blocks_per_op']:>10.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Pong benchmark suite")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Allowed slowdown before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = run(names)
+    baseline = load_baseline(args.baseline)
+    print_results(results, baseline)
+    if not args.filter:
+        print(f"\nPython heap per extra Game instance: {memory_per_game() / 1024:.1f} KB")
+
+    if not baseline and not args.save_baseline:
+        print(f"No baseline for this machine yet; saving one to {args.baseline}")
+        args.save_baseline = True
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump({**baseline, **results}, file, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    found = regressions(results, baseline, args.threshold)
+    for line in found:
+        print(f"REGRESSION {line}")
+    return 1 if found else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
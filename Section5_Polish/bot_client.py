@@ -0,0 +1,126 @@
+"""
+Bot Client
+
+Load tester for server.py: opens many connections that play like real clients.
+
+- Bots pair up into versus rooms (or each takes a room against the CPU with
+  --vs-cpu), follow the ball with their paddle, serve when the ball is
+  waiting and start a new match from the results screen.
+- Like a real client they only send INPUT when what they hold changes or
+  they press a key; the server keeps the held direction between messages.
+  Every snapshot is decoded with snapshot_codec.SnapshotDecoder and acked.
+- Every report interval prints the states received per second, bandwidth,
+  average state size and the longest gap between two states seen by any
+  bot, which is where a server that's falling behind shows up first.
+
+Run:  python bot_client.py --bots 400 --port 7777
+"""
+
+import argparse
+import asyncio
+import time
+from engine import Match, Inputs, PADDLE_SIZE, BALL_SIZE
+from replay import encode_inputs
+from server import JOIN, INPUT, WELCOME, FULL, STATE, ACK, frame, read_message
+from snapshot_codec import SnapshotDecoder, BALL_Y, BALL_ACTIVE, PLAYER_Y, OPPONENT_Y, GAME_STATE
+
+RESULTS_STATE = Match.GAME_STATES.index("game_results")
+DEAD_ZONE = 10
+
+class LoadStats:
+    def __init__(self):
+        self.states = 0
+        self.bytes = 0
+        self.worst_gap = 0.0
+        self.connected = 0
+        self.rejected = 0
+
+    def reset(self):
+        self.states = 0
+        self.bytes = 0
+        self.worst_gap = 0.0
+
+def choose_inputs(state, side):
+    """Chase the ball; serve when it's waiting; from the results screen, menu (resets the scores) then a new match."""
+    if state[GAME_STATE] == RESULTS_STATE:
+        return Inputs(presses=("1", "2"))
+    presses = () if state[BALL_ACTIVE] else ("space",)
+    paddle_center = state[PLAYER_Y if side == 0 else OPPONENT_Y] + PADDLE_SIZE[1] // 2
+    ball_center = state[BALL_Y] + BALL_SIZE[1] // 2
+    return Inputs(ball_center < paddle_center - DEAD_ZONE, ball_center > paddle_center + DEAD_ZONE, presses)
+
+async def run_bot(host, port, room, vs_cpu, stats):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(frame(JOIN, bytes((int(vs_cpu),)) + room.encode()))
+    message_type, payload = await read_message(reader)
+    if message_type == FULL:
+        stats.rejected += 1
+        writer.close()
+        return
+    assert message_type == WELCOME
+    side = payload[0]
+    decoder = SnapshotDecoder(*payload[1:3])
+    stats.connected += 1
+
+    held = (False, False)
+    last_state_time = None
+    try:
+        while True:
+            message_type, payload = await read_message(reader)
+            if message_type != STATE:
+                continue
+            now = time.perf_counter()
+            if last_state_time is not None:
+                stats.worst_gap = max(stats.worst_gap, now - last_state_time)
+            last_state_time = now
+            stats.states += 1
+            stats.bytes += len(payload) + 3
+
+            state = decoder.decode(payload)
+            writer.write(frame(ACK, bytes((decoder.sequence,))))
+            inputs = choose_inputs(state, side)
+            if inputs.presses or (inputs.up, inputs.down) != held:
+                held = (inputs.up, inputs.down)
+                writer.write(frame(INPUT, encode_inputs(inputs)))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        stats.connected -= 1
+        writer.close()
+
+async def report(stats, interval):
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        elapsed = time.perf_counter() - start
+        average = stats.bytes / stats.states if stats.states else 0
+        print(f"{stats.connected} bots connected ({stats.rejected} rejected): "
+              f"{stats.states / elapsed:,.0f} states/s, {stats.bytes / elapsed / 1024:,.1f} KB/s, "
+              f"{average:.1f} bytes/state, worst gap {stats.worst_gap * 1000:.0f} ms")
+        stats.reset()
+
+async def run_load(host, port, bots, vs_cpu, interval, connect_rate):
+    stats = LoadStats()
+    tasks = [asyncio.create_task(report(stats, interval))]
+    for index in range(bots):
+        room = f"bot-{index if vs_cpu else index // 2}"
+        tasks.append(asyncio.create_task(run_bot(host, port, room, vs_cpu, stats)))
+        await asyncio.sleep(1 / connect_rate)   # Don't hit the listen backlog all at once
+    await asyncio.gather(*tasks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a Pong match server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--bots", type=int, default=200)
+    parser.add_argument("--vs-cpu", action="store_true", help="One bot per room against the CPU")
+    parser.add_argument("--report", type=float, default=5.0, help="Seconds between stats lines")
+    parser.add_argument("--connect-rate", type=float, default=200.0, help="New connections per second")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_load(args.host, args.port, args.bots, args.vs_cpu, args.report, args.connect_rate))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Swept Collision Detection
+
+Continuous (swept AABB) collision for the ball, used instead of the simple
+move-then-colliderect check when a Match is created with collision="swept".
+
+- Finds the exact time of impact within a tick against the top/bottom walls
+  and both paddles, so a fast ball cannot tunnel through a 10px paddle.
+- Handles several bounces in one tick (e.g. a corner, or wall then paddle).
+- Only surfaces the ball is moving towards can be hit, so the ball never
+  double-flips while overlapping a paddle.
+- Every bounce is reported as a Contact with its time and contact point.
+
+bounce_out() is the simpler overlap response used for arena obstacles and
+ball–ball contacts found through the spatial hash.
+"""
+
+MAX_BOUNCES = 8   # Safety cap on bounces resolved inside a single tick
+INFINITY = float("inf")
+
+class Contact:
+    __slots__ = ("time", "point", "normal", "kind")
+
+    def __init__(self, time, point, normal, kind):
+        self.time = time       # Fraction of the tick (0-1) when the hit happened
+        self.point = point     # (x, y) where the ball touched the surface
+        self.normal = normal   # Surface normal, e.g. (0, 1) for the top wall
+        self.kind = kind       # "wall" or "paddle"
+
+    def __repr__(self):
+        return f"Contact({self.kind}, t={self.time:.3f}, point={self.point}, normal={self.normal})"
+
+def _axis_times(start, end, box_start, box_end, speed):
+    # Entry / exit times along one axis for an interval moving at speed
+    if speed > 0:
+        return (box_start - end) / speed, (box_end - start) / speed
+    if speed < 0:
+        return (box_end - start) / speed, (box_start - end) / speed
+    if end <= box_start or start >= box_end:
+        return INFINITY, -INFINITY  # Never overlaps on this axis
+    return -INFINITY, INFINITY
+
+def sweep_box(x, y, width, height, x_speed, y_speed, box):
+    """Time of impact (0-1 of the move) and normal of a moving box against a static rect, or None."""
+    x_entry, x_exit = _axis_times(x, x + width, box.left, box.right, x_speed)
+    y_entry, y_exit = _axis_times(y, y + height, box.top, box.bottom, y_speed)
+
+    entry = max(x_entry, y_entry)
+    exit_time = min(x_exit, y_exit)
+    if entry >= exit_time or entry < 0 or entry > 1:
+        return None
+
+    if x_entry > y_entry:
+        return entry, (-1 if x_speed > 0 else 1, 0)
+    return entry, (0, -1 if y_speed > 0 else 1)
+
+def sweep_walls(y, height, y_speed, top, bottom):
+    """Time of impact (0-1 of the move) and normal against the top/bottom walls, or None."""
+    if y_speed < 0 and y + y_speed <= top:
+        return max(0.0, (top - y) / y_speed), (0, 1)
+    if y_speed > 0 and y + height + y_speed >= bottom:
+        return max(0.0, (bottom - y - height) / y_speed), (0, -1)
+    return None
+
+def sweep_ball(ball, paddles, top, bottom):
+    """Move ball.rect by its speed for one tick, bouncing off walls and paddles.
+
+    Updates ball.rect, ball.x_speed and ball.y_speed in place and returns the
+    list of Contacts in the order they happened.
+    """
+    rect = ball.rect
+    x, y = float(rect.x), float(rect.y)
+    width, height = rect.width, rect.height
+    contacts = []
+    elapsed = 0.0
+
+    while elapsed < 1 and len(contacts) < MAX_BOUNCES:
+        remaining = 1 - elapsed
+        x_move = ball.x_speed * remaining
+        y_move = ball.y_speed * remaining
+
+        # == Earliest Hit ==
+        hit = sweep_walls(y, height, y_move, top, bottom)
+        target = None
+        for paddle in paddles:
+            paddle_hit = sweep_box(x, y, width, height, x_move, y_move, paddle.rect)
+            if paddle_hit is not None and (hit is None or paddle_hit[0] < hit[0]):
+                hit = paddle_hit
+                target = paddle.rect
+
+        if hit is None:
+            x += x_move
+            y += y_move
+            break
+
+        # == Move To Impact And Reflect ==
+        time_of_impact, normal = hit
+        x += x_move * time_of_impact
+        y += y_move * time_of_impact
+        elapsed += remaining * time_of_impact
+
+        if normal[0]:
+            ball.x_speed *= -1
+            point_x = x if normal[0] > 0 else x + width
+            point = (point_x, min(max(y + height / 2, target.top), target.bottom))
+        else:
+            ball.y_speed *= -1
+            point_y = y if normal[1] > 0 else y + height
+            point = (x + width / 2, point_y)
+
+        contacts.append(Contact(elapsed, point, normal, "wall" if target is None else "paddle"))
+
+    rect.x = round(x)
+    rect.y = round(y)
+    return contacts
+
+def bounce_out(x, y, width, height, x_speed, y_speed, box):
+    """Push a box out of an overlapping (x, y, w, h) box along the shallower axis.
+
+    The speed on that axis is pointed away from the box. Returns the new
+    (x, y, x_speed, y_speed).
+    """
+    box_x, box_y, box_width, box_height = box
+    push_left = box_x - (x + width)           # Negative: move left to get out
+    push_right = box_x + box_width - x        # Positive: move right to get out
+    push_up = box_y - (y + height)
+    push_down = box_y + box_height - y
+
+    push_x = push_left if -push_left < push_right else push_right
+    push_y = push_up if -push_up < push_down else push_down
+
+    if abs(push_x) < abs(push_y):
+        return x + push_x, y, abs(x_speed) if push_x > 0 else -abs(x_speed), y_speed
+    return x, y + push_y, x_speed, abs(y_speed) if push_y > 0 else -abs(y_speed)
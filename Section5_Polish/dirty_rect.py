@@ -0,0 +1,75 @@
+"""
+Dirty Rectangle Renderer
+
+Optional renderer that only pushes the parts of the screen that changed.
+
+- The background is the current state's pre-composited static layer.
+- Sprites and text are blitted through the renderer, which remembers where
+  each surface landed this frame and last frame.
+- Each frame the old spots are restored from the background, everything is
+  drawn again, and only rects whose contents changed are sent to
+  pygame.display.update instead of flipping the whole 1280x720 window.
+- Enable it with DIRTY_RECTS = True in main.py.
+"""
+
+import pygame
+
+class DirtyRectRenderer:
+    def __init__(self, screen):
+        self.screen = screen
+        self.background = None
+
+        self.previous = []   # (surface, rect) pairs drawn last frame
+        self.current = []    # (surface, rect) pairs drawn this frame
+        self.full_redraw = True
+
+        # == Stats ==
+        self.rects_updated = 0
+        self.pixels_updated = 0
+
+    def set_background(self, surface):
+        # A new background surface (e.g. state change) means a full redraw
+        if surface is not self.background:
+            self.background = surface
+            self.invalidate()
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def begin(self):
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            # Restore the background wherever something was drawn last frame
+            for _, rect in self.previous:
+                self.screen.blit(self.background, rect, rect)
+        self.current = []
+
+    def blit(self, source, dest, area=None):
+        # Same signature as Surface.blit so draw helpers can use either
+        rect = self.screen.blit(source, dest, area)
+        self.current.append((source, rect))
+        return rect
+
+    def dirty_rects(self):
+        previous_keys = {(id(surface), tuple(rect)) for surface, rect in self.previous}
+        current_keys = {(id(surface), tuple(rect)) for surface, rect in self.current}
+
+        dirty = [rect for surface, rect in self.previous if (id(surface), tuple(rect)) not in current_keys]
+        dirty += [rect for surface, rect in self.current if (id(surface), tuple(rect)) not in previous_keys]
+        return dirty
+
+    def present(self):
+        if self.full_redraw:
+            pygame.display.flip()
+            dirty = [self.screen.get_rect()]
+            self.full_redraw = False
+        else:
+            dirty = self.dirty_rects()
+            if dirty:
+                pygame.display.update(dirty)
+
+        self.rects_updated = len(dirty)
+        self.pixels_updated = sum(rect.width * rect.height for rect in dirty)
+        self.previous = self.current
+        return dirty
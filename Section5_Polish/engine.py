@@ -0,0 +1,638 @@
+"""
+Pong Engine
+
+Pure-Python Pong simulation with no pygame, display or audio dependency.
+
+- Match holds the whole game state and advances it with step(inputs).
+- Inputs describes one tick of player input (held direction + key presses).
+- Rect mirrors the integer pygame.Rect behaviour used by the original classes,
+  so the simulation plays out identically with or without a window.
+- Sounds, music and drawing are handled by observers that listen to the
+  events emitted during a step ("wall_hit", "paddle_hit", "win_point", ...).
+- Serve directions come from a small seeded RNG owned by each Match, so the
+  same seed and inputs always replay the same match (see replay.py).
+- snapshot() / restore() capture the whole simulation as a small tuple.
+- Speeds are in pixels per tick; every body remembers its previous position
+  so a renderer can interpolate between ticks (fixed-timestep loop in main.py).
+- Uses hardcoded 1280x720 bounds, the same as the rest of the tutorial.
+"""
+
+import random
+from collision import sweep_ball, bounce_out
+from spatial_hash import SpatialHash
+from profiler import NULL_PROFILER
+from ball_pool import BallPool
+
+SCREEN_WIDTH = 1280
+SCREEN_HEIGHT = 720
+
+BALL_SIZE = (30, 30)      # Matches ../assets/blue_ball.png
+PADDLE_SIZE = (10, 140)   # Matches ../assets/blue_paddle.png
+
+class Rect:
+    """Integer rectangle with the subset of pygame.Rect the game relies on."""
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def from_center(cls, center, size):
+        rect = cls(0, 0, size[0], size[1])
+        rect.center = center
+        return rect
+
+    # == Edges ==
+    @property
+    def left(self):
+        return self.x
+
+    @left.setter
+    def left(self, value):
+        self.x = value
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @right.setter
+    def right(self, value):
+        self.x = value - self.width
+
+    @property
+    def top(self):
+        return self.y
+
+    @top.setter
+    def top(self, value):
+        self.y = value
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    @bottom.setter
+    def bottom(self, value):
+        self.y = value - self.height
+
+    # == Centers ==
+    @property
+    def centerx(self):
+        return self.x + self.width // 2
+
+    @centerx.setter
+    def centerx(self, value):
+        self.x = value - self.width // 2
+
+    @property
+    def centery(self):
+        return self.y + self.height // 2
+
+    @centery.setter
+    def centery(self, value):
+        self.y = value - self.height // 2
+
+    @property
+    def center(self):
+        return (self.centerx, self.centery)
+
+    @center.setter
+    def center(self, value):
+        self.centerx, self.centery = value
+
+    @property
+    def topleft(self):
+        return (self.x, self.y)
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    def colliderect(self, other):
+        if not (self.width and self.height and other.width and other.height):
+            return False
+        return (self.x < other.x + other.width and other.x < self.x + self.width and
+                self.y < other.y + other.height and other.y < self.y + self.height)
+
+    def copy(self):
+        return Rect(self.x, self.y, self.width, self.height)
+
+    def __repr__(self):
+        return f"Rect({self.x}, {self.y}, {self.width}, {self.height})"
+
+class Inputs:
+    """One tick of input: held paddle direction plus any keys pressed this tick."""
+    __slots__ = ("up", "down", "presses")
+
+    def __init__(self, up=False, down=False, presses=()):
+        self.up = up
+        self.down = down
+        self.presses = presses   # Key names: "1" - "8" and "space"
+
+NO_INPUT = Inputs()
+
+MASK_64 = (1 << 64) - 1
+AI_SEED_SALT = 0x5DEECE66D   # Keeps the opponent's aim RNG independent of serves
+
+# Anything that changes the ball's path makes a predicting opponent re-plan
+REPLAN_EVENTS = ("wall_hit", "paddle_hit", "lose_point", "win_point")
+REPLAN_KEYS = ("space", "7", "8")
+
+class MatchRandom:
+    """SplitMix64 generator: deterministic, and its whole state is one integer."""
+    __slots__ = ("state",)
+
+    def __init__(self, seed):
+        self.state = seed & MASK_64
+
+    def next(self):
+        self.state = (self.state + 0x9E3779B97F4A7C15) & MASK_64
+        z = self.state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK_64
+        return z ^ (z >> 31)
+
+    def choice(self, options):
+        return options[self.next() % len(options)]
+
+    def randint(self, low, high):
+        # Inclusive, like random.randint
+        return low + self.next() % (high - low + 1)
+
+    def getstate(self):
+        return self.state
+
+    def setstate(self, state):
+        self.state = state
+
+class Body:
+    """Anything with a rect that moves; remembers where it was last tick for interpolation."""
+    def __init__(self, center, size):
+        self.rect = Rect.from_center(center, size)
+        self.previous_topleft = self.rect.topleft
+
+    def store_previous(self):
+        self.previous_topleft = self.rect.topleft
+
+    def interpolated_topleft(self, alpha):
+        # alpha = 0 -> last tick's position, alpha = 1 -> current position
+        previous_x, previous_y = self.previous_topleft
+        return (
+            round(previous_x + (self.rect.x - previous_x) * alpha),
+            round(previous_y + (self.rect.y - previous_y) * alpha)
+        )
+
+class BallBody(Body):
+    def __init__(self, x_position, y_position, x_speed, y_speed, size=BALL_SIZE, swept=False, rng=random):
+        super().__init__((x_position, y_position), size)
+        self.rng = rng   # Anything with choice(); the global random module by default
+
+        self.x_speed = x_speed * rng.choice((-1, 1))
+        self.y_speed = y_speed * rng.choice((-1, 1))
+
+        self.active = False  # Ball starts inactive until the game begins
+
+        self.swept = swept   # Use continuous collision (collision.py)
+        self.contacts = []   # Contacts from the last swept move
+
+    def update(self, player, opponent, emit):
+        if not self.active:
+            return
+
+        if self.swept:
+            self.contacts = sweep_ball(self, (player, opponent), 0, SCREEN_HEIGHT)
+            for contact in self.contacts:
+                emit(contact.kind + "_hit")
+        else:
+            self.move()
+            self.check_collisions(player, opponent, emit)
+
+    def move(self):
+        self.rect.x += self.x_speed
+        self.rect.y += self.y_speed
+
+    def check_collisions(self, player, opponent, emit):
+        # Wall collisions
+        if self.rect.top <= 0:
+            self.rect.top = 0
+            self.y_speed *= -1
+            emit("wall_hit")
+
+        if self.rect.bottom >= SCREEN_HEIGHT:
+            self.rect.bottom = SCREEN_HEIGHT
+            self.y_speed *= -1
+            emit("wall_hit")
+
+        # Paddle collisions (simple version only flips horizontal direction)
+        if self.rect.colliderect(player.rect):
+            self.x_speed *= -1
+            emit("paddle_hit")
+        if self.rect.colliderect(opponent.rect):
+            self.x_speed *= -1
+            emit("paddle_hit")
+
+    def reset(self):
+        # re-center to middle of screen
+        self.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.store_previous()  # Teleport, don't interpolate across the screen
+        self.active = False
+
+    def start(self):
+        self.active = True
+        self.x_speed = abs(self.x_speed) * self.rng.choice((-1, 1))
+        self.y_speed = abs(self.y_speed) * self.rng.choice((-1, 1))
+
+class PaddleBody(Body):
+    def __init__(self, starting_x_position, starting_y_position, speed, size=PADDLE_SIZE):
+        super().__init__((starting_x_position, starting_y_position), size)
+        self.speed = speed
+
+    def clamp(self):
+        # Boundary constraints
+        if self.rect.top <= 0:
+            self.rect.top = 0
+        if self.rect.bottom >= SCREEN_HEIGHT:
+            self.rect.bottom = SCREEN_HEIGHT
+
+class PlayerBody(PaddleBody):
+    def update(self, inputs):
+        if inputs.up:
+            self.rect.y -= self.speed
+        if inputs.down:
+            self.rect.y += self.speed
+        self.clamp()
+
+def predict_intercept_y(x, y, x_speed, y_speed, target_x, ball_height, top=0, bottom=SCREEN_HEIGHT):
+    """Ball top y when its x reaches target_x, with wall bounces folded in closed form.
+
+    Pure arithmetic (no loops or branches on values), so it works on plain
+    numbers and element-wise on NumPy arrays alike. x_speed must not be 0.
+    """
+    travel = bottom - top - ball_height        # Room the ball's top edge has to move in
+    unfolded = y - top + y_speed * (target_x - x) / x_speed
+    folded = unfolded % (2 * travel)           # Position within one up-and-back cycle
+    return top + travel - abs(folded - travel)
+
+class OpponentBody(PaddleBody):
+    """CPU paddle.
+
+    strategy "chase" follows the ball's centre every tick (the original AI).
+    strategy "predict" works out where the ball will cross this paddle only
+    when the ball's path changes (bounce, serve, speed change), waits
+    reaction_delay ticks, and heads there with up to aim_error px of error.
+    strategy "table" plans the same way but reads the intercept from a
+    precomputed intercept_table (see intercept_table.py).
+    strategy "remote" isn't an AI: the paddle follows opponent_inputs passed
+    to Match.step, e.g. from a network peer (see netplay.py).
+    """
+    def __init__(self, starting_x_position, starting_y_position, speed, size=PADDLE_SIZE,
+                 strategy="chase", reaction_delay=0, aim_error=0, seed=0, intercept_table=None):
+        super().__init__(starting_x_position, starting_y_position, speed, size)
+        self.strategy = strategy
+        self.intercept_table = intercept_table
+        self.reaction_delay = reaction_delay
+        self.aim_error = aim_error
+        self.rng = MatchRandom(seed)   # Separate from the serve RNG
+
+        # == Prediction State ==
+        self.replan = True
+        self.target_y = self.rect.centery
+        self.pending_target_y = self.rect.centery
+        self.countdown = 0
+
+    def update(self, ball):
+        if self.strategy != "chase":
+            self.update_predict(ball)
+            return
+
+        if ball.x_speed == 0:
+            return
+
+        # Movement
+        if self.rect.centery < ball.rect.centery:
+            self.rect.y += self.speed
+        elif self.rect.centery > ball.rect.centery:
+            self.rect.y -= self.speed
+        self.clamp()
+
+    def update_remote(self, inputs):
+        # Same movement as PlayerBody.update
+        if inputs.up:
+            self.rect.y -= self.speed
+        if inputs.down:
+            self.rect.y += self.speed
+        self.clamp()
+
+    def update_predict(self, ball):
+        if self.replan:
+            self.pending_target_y = self.plan(ball)
+            self.countdown = self.reaction_delay
+            self.replan = False
+
+        if self.countdown > 0:
+            self.countdown -= 1
+        else:
+            self.target_y = self.pending_target_y
+
+        # Step towards the target without overshooting (no jitter around it)
+        difference = self.target_y - self.rect.centery
+        self.rect.y += max(-self.speed, min(self.speed, difference))
+        self.clamp()
+
+    def plan(self, ball):
+        if not ball.active or ball.x_speed == 0:
+            return ball.rect.centery
+
+        heading_here = (ball.x_speed > 0) == (self.rect.centerx > ball.rect.centerx)
+        if not heading_here:
+            return SCREEN_HEIGHT // 2   # Recover to the middle while the ball is away
+
+        if self.strategy == "table":
+            if self.rect.centerx < SCREEN_WIDTH // 2:
+                # The table is built for the right paddle, so mirror the ball for a left one
+                ball_center_y = self.intercept_table.lookup(SCREEN_WIDTH - ball.rect.right, ball.rect.y, -ball.x_speed, ball.y_speed)
+            else:
+                ball_center_y = self.intercept_table.lookup(ball.rect.x, ball.rect.y, ball.x_speed, ball.y_speed)
+        else:
+            target_x = self.rect.left - ball.rect.width if ball.x_speed > 0 else self.rect.right
+            ball_y = predict_intercept_y(ball.rect.x, ball.rect.y, ball.x_speed, ball.y_speed, target_x, ball.rect.height)
+            ball_center_y = round(ball_y) + ball.rect.height // 2
+
+        error = 0
+        if self.aim_error:
+            error = self.rng.next() % (2 * self.aim_error + 1) - self.aim_error
+        return ball_center_y + error
+
+class Match:
+    """Full game state. collision is "discrete" (original behaviour) or "swept".
+
+    seed fixes every serve direction; without one a random seed is picked
+    (and kept in self.seed so the match can still be recorded).
+
+    obstacles is a sequence of (x, y, width, height) boxes the balls bounce
+    off; ball_collisions makes multi-ball balls bounce off each other.
+    The first side to win_score points wins the match.
+    """
+    def __init__(self, ball_size=BALL_SIZE, paddle_size=PADDLE_SIZE, collision="discrete", seed=None,
+                 opponent_strategy="chase", reaction_delay=0, aim_error=0,
+                 opponent_speed=10, intercept_table=None, extra_balls=0,
+                 obstacles=(), ball_collisions=False, win_score=3):
+        # == Game State ==
+        self.game_state = "menu"
+        self.collision = collision
+
+        # == Randomness ==
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.opponent_start_speed = opponent_speed
+        self.rng = MatchRandom(self.seed)
+
+        # == Bodies ==
+        self.ball = BallBody(
+            x_position = SCREEN_WIDTH // 2,
+            y_position = SCREEN_HEIGHT // 2,
+            x_speed = 8,
+            y_speed = 8,
+            size = ball_size,
+            swept = collision == "swept",
+            rng = self.rng
+        )
+        self.player = PlayerBody(
+            starting_x_position = 10,
+            starting_y_position = SCREEN_HEIGHT // 2,
+            speed = 10,
+            size = paddle_size
+        )
+        self.opponent = OpponentBody(
+            starting_x_position = SCREEN_WIDTH - 10,
+            starting_y_position = SCREEN_HEIGHT // 2,
+            speed = opponent_speed,
+            size = paddle_size,
+            strategy = opponent_strategy,
+            reaction_delay = reaction_delay,
+            aim_error = aim_error,
+            seed = self.seed ^ AI_SEED_SALT,
+            intercept_table = intercept_table
+        )
+
+        # == Multi-ball ("chaos") Mode ==
+        # Extra balls join (staggered) on every serve and respawn after a delay when they score.
+        # Only the main ball scores: pool goals emit "pool_goal" but don't count towards win_score
+        self.extra_balls = extra_balls
+        self.ball_pool = BallPool(extra_balls, ball_size, (SCREEN_WIDTH, SCREEN_HEIGHT)) if extra_balls else None
+
+        # == Arena ==
+        # Obstacles sit in the grid as ids -1, -2, ...; pool balls use their slot index
+        self.obstacles = tuple(tuple(box) for box in obstacles)
+        self.ball_collisions = ball_collisions
+        self.grid = None
+        if self.obstacles or (self.ball_pool and ball_collisions):
+            self.grid = SpatialHash()
+            for index, box in enumerate(self.obstacles):
+                self.grid.insert(-1 - index, box)
+
+        # == Scores ==
+        self.player_score = 0
+        self.opponent_score = 0
+        self.win_score = win_score
+
+        # == Observers ==
+        self.observers = []   # Callables taking (event, match)
+        self.tick = 0
+        self.profiler = NULL_PROFILER   # Times the ball / player / opponent updates (profiler.py)
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def emit(self, event):
+        if event in REPLAN_EVENTS:
+            self.opponent.replan = True
+        for observer in self.observers:
+            observer(event, self)
+
+    def step(self, inputs=NO_INPUT, opponent_inputs=NO_INPUT):
+        # opponent_inputs only matter with opponent_strategy="remote"
+        for key in inputs.presses + opponent_inputs.presses:
+            self.handle_key(key)
+
+        self.ball.store_previous()
+        self.player.store_previous()
+        self.opponent.store_previous()
+
+        if self.game_state == "game":
+            self.update_bodies(inputs, opponent_inputs)
+
+            # == Scoring ==
+            if self.ball.rect.left < 0:
+                self.opponent_score += 1
+                self.emit("lose_point")
+                self.ball.reset()
+            elif self.ball.rect.right > SCREEN_WIDTH:
+                self.player_score += 1
+                self.emit("win_point")
+                self.ball.reset()
+
+            # == Win Condition ==
+            if self.player_score >= self.win_score or self.opponent_score >= self.win_score:
+                self.game_state = "game_results"
+                self.emit("match_over")
+
+        self.tick += 1
+
+    def update_bodies(self, inputs, opponent_inputs):
+        profiler = self.profiler
+        if not profiler.enabled:
+            self.update_balls()
+            self.player.update(inputs)
+            self.update_opponent(opponent_inputs)
+            return
+
+        with profiler.section("ball"):
+            self.update_balls()
+        with profiler.section("player"):
+            self.player.update(inputs)
+        with profiler.section("opponent"):
+            self.update_opponent(opponent_inputs)
+
+    def update_opponent(self, opponent_inputs):
+        if self.opponent.strategy == "remote":
+            self.opponent.update_remote(opponent_inputs)
+        else:
+            self.opponent.update(self.ball)
+
+    def update_balls(self):
+        self.ball.update(self.player, self.opponent, self.emit)
+        if self.obstacles:
+            self.bounce_ball_off_obstacles()
+        if self.ball_pool:
+            self.step_ball_pool()
+
+    def step_ball_pool(self):
+        speed = max(abs(self.ball.x_speed), abs(self.ball.y_speed))
+        wall_hits, paddle_hits, goals = self.ball_pool.step(
+            self.player.rect, self.opponent.rect, speed, self.rng
+        )
+
+        if self.grid:
+            obstacle_hits, ball_hits = self.ball_pool.resolve_contacts(
+                self.grid, self.obstacles, self.ball_collisions
+            )
+            wall_hits += obstacle_hits
+            if ball_hits:
+                self.emit("ball_hit")
+
+        # One event per kind per tick, however many balls bounced
+        if wall_hits:
+            self.emit("wall_hit")
+        if paddle_hits:
+            self.emit("paddle_hit")
+        if goals:
+            self.emit("pool_goal")
+
+    def bounce_ball_off_obstacles(self):
+        ball = self.ball
+        rect = ball.rect
+        hits = [key for key in self.grid.query((rect.x, rect.y, rect.width, rect.height)) if key < 0]
+        for key in sorted(hits, reverse=True):   # -1 first, so the order is fixed
+            rect.x, rect.y, ball.x_speed, ball.y_speed = bounce_out(
+                rect.x, rect.y, rect.width, rect.height, ball.x_speed, ball.y_speed, self.obstacles[-1 - key]
+            )
+        if hits:
+            self.emit("wall_hit")
+
+    def handle_key(self, key):
+        if key in REPLAN_KEYS:
+            self.opponent.replan = True
+
+        # == Navigation ==
+        if key == "1" and self.game_state != "menu":
+            self.return_to_menu()
+
+        if key == "2" and self.game_state != "game":
+            self.start_game()
+
+        if not self.ball.active and key == "space":
+            self.ball.start()
+            if self.ball_pool:
+                self.ball_pool.schedule(self.extra_balls - self.ball_pool.count, self.rng)
+
+        # == Opponent Speed ==
+        if key == "3":
+            self.opponent.speed = max(4, self.opponent.speed - 1)
+        if key == "4":
+            self.opponent.speed = min(16, self.opponent.speed + 1)
+
+        # == Player Speed ==
+        if key == "5":
+            self.player.speed = max(4, self.player.speed - 1)
+        if key == "6":
+            self.player.speed = min(16, self.player.speed + 1)
+
+        # == Ball Speed (handle signs correctly) ==
+        if key == "7":
+            self.ball.x_speed = max(4, abs(self.ball.x_speed) - 1) * (1 if self.ball.x_speed >= 0 else -1)
+            self.ball.y_speed = max(4, abs(self.ball.y_speed) - 1) * (1 if self.ball.y_speed >= 0 else -1)
+        if key == "8":
+            self.ball.x_speed = min(16, abs(self.ball.x_speed) + 1) * (1 if self.ball.x_speed >= 0 else -1)
+            self.ball.y_speed = min(16, abs(self.ball.y_speed) + 1) * (1 if self.ball.y_speed >= 0 else -1)
+
+    def return_to_menu(self):
+        self.game_state = "menu"
+        self.ball.active = False
+        if self.ball_pool:
+            self.ball_pool.clear()
+        self.player_score = 0
+        self.opponent_score = 0
+        self.emit("return_to_menu")
+
+    def start_game(self):
+        self.game_state = "game"
+        self.emit("start_game")
+
+    # == Snapshots ==
+    GAME_STATES = ("menu", "game", "game_results")
+
+    def snapshot(self):
+        """Everything the simulation needs to continue, as a flat tuple of ints.
+
+        In multi-ball mode the ball pool's columns are appended as one extra item.
+        """
+        ball, player, opponent = self.ball, self.player, self.opponent
+        return (
+            self.tick, self.GAME_STATES.index(self.game_state), self.rng.getstate(),
+            ball.rect.x, ball.rect.y, ball.x_speed, ball.y_speed, int(ball.active),
+            player.rect.y, player.speed,
+            opponent.rect.y, opponent.speed,
+            self.player_score, self.opponent_score,
+            int(opponent.replan), opponent.target_y, opponent.pending_target_y,
+            opponent.countdown, opponent.rng.getstate(),
+        ) + ((self.ball_pool.snapshot(),) if self.ball_pool else ())
+
+    def restore(self, snapshot):
+        (self.tick, state, rng_state,
+         ball_x, ball_y, self.ball.x_speed, self.ball.y_speed, active,
+         self.player.rect.y, self.player.speed,
+         self.opponent.rect.y, self.opponent.speed,
+         self.player_score, self.opponent_score,
+         replan, self.opponent.target_y, self.opponent.pending_target_y,
+         self.opponent.countdown, ai_rng_state, *pool) = snapshot
+
+        self.game_state = self.GAME_STATES[state]
+        self.rng.setstate(rng_state)
+        self.ball.rect.x, self.ball.rect.y = ball_x, ball_y
+        self.ball.active = bool(active)
+        self.opponent.replan = bool(replan)
+        self.opponent.rng.setstate(ai_rng_state)
+        if self.ball_pool:
+            self.ball_pool.restore(pool[0])
+        for body in (self.ball, self.player, self.opponent):
+            body.store_previous()
+
+    @property
+    def winner(self):
+        return "Player" if self.player_score >= self.win_score else "CPU"
@@ -0,0 +1,263 @@
+"""
+Training Environments
+
+Gymnasium-style environments for training an agent to control the Player paddle.
+
+- PongEnv wraps one engine.Match: reset() -> (observation, info) and
+  step(action) -> (observation, reward, terminated, truncated, info).
+- Actions are 0 (stay), 1 (up) and 2 (down). Reward is +1 when the player
+  scores and -1 when the CPU does; an episode ends at the match's win score.
+- There's no one to press SPACE, so the ball is served again automatically.
+- frame_skip repeats each action for that many ticks and sums the reward.
+- observation="vector" gives 6 floats (ball x/y/speeds, both paddles' y),
+  observation="pixels" gives a small uint8 image (pixel_size, default 64x36)
+  drawn straight into a NumPy array, so no window or pygame Surface is needed.
+- PongVecEnv steps num_envs environments per call, either all in-process on
+  BatchPong's arrays (backend="numpy", the fast one) or as PongEnvs spread
+  over worker processes (backend="subprocess", which runs the full engine).
+  Finished environments are reset automatically, like Gymnasium's vector envs.
+
+Uses hardcoded 1280x720 bounds, the same as the rest of the tutorial.
+"""
+
+import multiprocessing
+import numpy as np
+from engine import Match, Inputs, SCREEN_WIDTH, SCREEN_HEIGHT
+from batch import BatchPong
+
+ACTIONS = (Inputs(), Inputs(up=True), Inputs(down=True))
+SERVE = Inputs(presses=("space",))
+PIXEL_SIZE = (64, 36)
+VECTOR_SIZE = 6
+
+# == Observations ==
+def vector_observation(ball_x, ball_y, ball_x_speed, ball_y_speed, player_y, opponent_y):
+    """Positions scaled to 0-1 and speeds to roughly -1-1; works on scalars or arrays."""
+    return np.stack(np.broadcast_arrays(
+        np.asarray(ball_x) / SCREEN_WIDTH, np.asarray(ball_y) / SCREEN_HEIGHT,
+        np.asarray(ball_x_speed) / 16, np.asarray(ball_y_speed) / 16,
+        np.asarray(player_y) / SCREEN_HEIGHT, np.asarray(opponent_y) / SCREEN_HEIGHT
+    ), axis=-1).astype(np.float32)
+
+def _cover(start, length, screen_length, pixels):
+    # Boolean (N, pixels) mask of the low-res pixels a span of the screen touches
+    first = start * pixels // screen_length
+    last = np.maximum(first + 1, -(-(start + length) * pixels // screen_length))
+    index = np.arange(pixels)
+    return (index >= first[:, None]) & (index < last[:, None])
+
+def pixel_observation(ball_x, ball_y, player_x, player_y, opponent_x, opponent_y,
+                      ball_size, paddle_size, pixel_size=PIXEL_SIZE):
+    """(N, height, width) uint8 images of N fields; every argument but the sizes is an array."""
+    width, height = pixel_size
+    ball_width, ball_height = ball_size
+    paddle_width, paddle_height = paddle_size
+    count = len(ball_y)
+
+    images = np.zeros((count, height, width), dtype=bool)
+    for x, y, w, h in (
+        (ball_x, ball_y, ball_width, ball_height),
+        (np.full(count, player_x), player_y, paddle_width, paddle_height),
+        (np.full(count, opponent_x), opponent_y, paddle_width, paddle_height),
+    ):
+        rows = _cover(np.asarray(y), h, SCREEN_HEIGHT, height)
+        columns = _cover(np.asarray(x), w, SCREEN_WIDTH, width)
+        images |= rows[:, :, None] & columns[:, None, :]
+    return images.astype(np.uint8) * 255
+
+class PongEnv:
+    num_actions = len(ACTIONS)
+
+    def __init__(self, observation="vector", frame_skip=1, max_steps=None,
+                 pixel_size=PIXEL_SIZE, **match_options):
+        if observation not in ("vector", "pixels"):
+            raise ValueError(f"Unknown observation type {observation!r}")
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.pixel_size = pixel_size
+        self.match_options = match_options
+        self.observation_shape = (VECTOR_SIZE,) if observation == "vector" else pixel_size[::-1]
+        self.match = None
+
+    def reset(self, seed=None):
+        self.match = Match(seed=seed, **self.match_options)
+        self.match.step(Inputs(presses=("2", "space")))
+        self.steps = 0
+        return self.observe(), self.info()
+
+    def step(self, action):
+        match = self.match
+        inputs = ACTIONS[action]
+        reward = 0
+        for _ in range(self.frame_skip):
+            player_score, opponent_score = match.player_score, match.opponent_score
+            match.step(inputs if match.ball.active else SERVE)
+            reward += (match.player_score - player_score) - (match.opponent_score - opponent_score)
+            if match.game_state != "game":
+                break
+
+        self.steps += 1
+        terminated = match.game_state == "game_results"
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return self.observe(), reward, terminated, truncated, self.info()
+
+    def observe(self):
+        ball, player, opponent = self.match.ball, self.match.player, self.match.opponent
+        if self.observation == "vector":
+            return vector_observation(
+                ball.rect.x, ball.rect.y, ball.x_speed, ball.y_speed, player.rect.y, opponent.rect.y
+            )
+        return pixel_observation(
+            np.array([ball.rect.x]), np.array([ball.rect.y]),
+            player.rect.x, np.array([player.rect.y]), opponent.rect.x, np.array([opponent.rect.y]),
+            ball.rect.size, player.rect.size, self.pixel_size
+        )[0]
+
+    def info(self):
+        return {"player_score": self.match.player_score, "opponent_score": self.match.opponent_score}
+
+def _worker(connection, env_options, count):
+    # Runs in a child process: owns count PongEnvs and answers PongVecEnv commands
+    envs = [PongEnv(**env_options) for _ in range(count)]
+    while True:
+        command, data = connection.recv()
+        if command == "reset":
+            connection.send([env.reset(seed) for env, seed in zip(envs, data)])
+        elif command == "step":
+            results = []
+            for env, action in zip(envs, data):
+                observation, reward, terminated, truncated, info = env.step(action)
+                if terminated or truncated:
+                    observation, _ = env.reset()
+                results.append((observation, reward, terminated, truncated, info))
+            connection.send(results)
+        elif command == "close":
+            connection.close()
+            return
+
+class PongVecEnv:
+    """num_envs environments stepped together; actions and results are arrays."""
+    num_actions = len(ACTIONS)
+
+    def __init__(self, num_envs, backend="numpy", observation="vector", frame_skip=1,
+                 max_steps=None, pixel_size=PIXEL_SIZE, workers=None, win_score=3, seed=None):
+        if backend not in ("numpy", "subprocess"):
+            raise ValueError(f"Unknown backend {backend!r}")
+        if observation not in ("vector", "pixels"):
+            raise ValueError(f"Unknown observation type {observation!r}")
+        self.num_envs = num_envs
+        self.backend = backend
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.pixel_size = pixel_size
+        self.seed = seed
+        self.observation_shape = (VECTOR_SIZE,) if observation == "vector" else pixel_size[::-1]
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+
+        if backend == "numpy":
+            self.batch = BatchPong(num_envs, win_score=win_score, seed=seed)
+        else:
+            self._start_workers(workers or multiprocessing.cpu_count(), win_score)
+
+    # == Subprocess Backend ==
+    def _start_workers(self, workers, win_score):
+        workers = min(workers, self.num_envs)
+        env_options = {"observation": self.observation, "frame_skip": self.frame_skip,
+                       "max_steps": self.max_steps, "pixel_size": self.pixel_size, "win_score": win_score}
+
+        # Split the environments as evenly as possible between the workers
+        self.chunks = [self.num_envs // workers + (index < self.num_envs % workers) for index in range(workers)]
+        self.connections = []
+        self.processes = []
+        for count in self.chunks:
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker, args=(child, env_options, count), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def _scatter(self, command, values):
+        start = 0
+        for connection, count in zip(self.connections, self.chunks):
+            connection.send((command, values[start:start + count]))
+            start += count
+        return [result for connection in self.connections for result in connection.recv()]
+
+    # == Gymnasium-style API ==
+    def reset(self, seed=None):
+        seed = self.seed if seed is None else seed
+        self.steps[:] = 0
+        if self.backend == "numpy":
+            if seed is not None:
+                self.batch.rng = np.random.default_rng(seed)
+            self.batch.reset()
+            return self.observe(), self.info()
+
+        seeds = [None if seed is None else seed + index for index in range(self.num_envs)]
+        results = self._scatter("reset", seeds)
+        return np.stack([observation for observation, _ in results]), self._stack_infos(info for _, info in results)
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        if self.backend == "subprocess":
+            results = self._scatter("step", actions.tolist())
+            observations, rewards, terminated, truncated, infos = zip(*results)
+            return (np.stack(observations), np.array(rewards, dtype=np.float32),
+                    np.array(terminated), np.array(truncated), self._stack_infos(infos))
+
+        batch = self.batch
+        # Action 1 (up) is direction -1, action 2 (down) is +1
+        direction = np.where(actions == 1, -1, np.where(actions == 2, 1, 0)).astype(np.int32)
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        for _ in range(self.frame_skip):
+            player_score, opponent_score = batch.player_score.copy(), batch.opponent_score.copy()
+            batch.step(direction)
+            rewards += (batch.player_score - player_score) - (batch.opponent_score - opponent_score)
+
+        self.steps += 1
+        terminated = batch.done.copy()
+        truncated = ~terminated & (self.steps >= self.max_steps) if self.max_steps else np.zeros(self.num_envs, dtype=bool)
+        info = self.info()
+
+        finished = terminated | truncated
+        if finished.any():
+            batch.reset_matches(finished)
+            self.steps[finished] = 0
+        return self.observe(), rewards, terminated, truncated, info
+
+    def observe(self):
+        batch = self.batch
+        if self.observation == "vector":
+            return vector_observation(
+                batch.ball_x, batch.ball_y, batch.ball_vx, batch.ball_vy, batch.player_y, batch.opponent_y
+            )
+        return pixel_observation(
+            batch.ball_x, batch.ball_y, batch.player_x, batch.player_y, batch.opponent_x, batch.opponent_y,
+            (batch.ball_width, batch.ball_height), (batch.paddle_width, batch.paddle_height), self.pixel_size
+        )
+
+    def info(self):
+        # Scores before any automatic reset, so finished episodes can still be read
+        return {"player_score": self.batch.player_score.copy(), "opponent_score": self.batch.opponent_score.copy()}
+
+    def _stack_infos(self, infos):
+        infos = list(infos)
+        return {key: np.array([info[key] for info in infos]) for key in infos[0]}
+
+    def close(self):
+        if self.backend == "subprocess":
+            for connection in self.connections:
+                connection.send(("close", None))
+            for process in self.processes:
+                process.join()
+            self.connections = []
+            self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,95 @@
+"""
+Frame Pacing
+
+Keeps the frame rate steady on slow machines by trading away optional work.
+
+- QualityController watches how long each frame's work takes (everything
+  except the clock.tick wait) against the frame budget. When the average
+  stays over budget it steps down a quality level; when there's been
+  plenty of headroom for a while it steps back up. The two windows are
+  different lengths so it doesn't flip back and forth. Only frames that
+  were drawn are fed in: a skipped frame isn't headroom.
+- Quality levels only touch optional work: antialiased text, how often the
+  profiler overlay re-renders, and whether frames with no new physics tick
+  are drawn at all (interpolation). Gameplay is never affected.
+- The current level is published to the profiler, so it shows on the F3 overlay.
+- FramePacer wraps the clock: tick() for the usual sleep-based cap or, with
+  busy_loop=True, Clock.tick_busy_loop for precise (but CPU-hungry) pacing.
+"""
+
+from profiler import NULL_PROFILER
+
+# From best to cheapest
+QUALITY_LEVELS = (
+    {"name": "high", "antialias": True, "overlay_refresh": 15, "interpolate": True},
+    {"name": "medium", "antialias": False, "overlay_refresh": 60, "interpolate": True},
+    {"name": "low", "antialias": False, "overlay_refresh": 120, "interpolate": False},
+)
+
+class QualityController:
+    def __init__(self, budget=1 / 60, degrade_after=30, restore_after=180,
+                 degrade_ratio=0.9, restore_ratio=0.5, profiler=NULL_PROFILER):
+        self.budget = budget                    # Seconds of work allowed per frame
+        self.degrade_after = degrade_after      # Frames over budget before stepping down
+        self.restore_after = restore_after      # Frames with headroom before stepping up
+        self.degrade_ratio = degrade_ratio
+        self.restore_ratio = restore_ratio
+        self.profiler = profiler
+        self.listeners = []                     # Callables taking the new settings dict
+
+        self.level = 0
+        self.over_budget = 0
+        self.under_budget = 0
+        self.publish()
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+        listener(self.settings)
+
+    def update(self, work_time):
+        """Feed one frame's work time (seconds); returns True if the level changed."""
+        if work_time > self.budget * self.degrade_ratio:
+            self.over_budget += 1
+            self.under_budget = 0
+        elif work_time < self.budget * self.restore_ratio:
+            self.under_budget += 1
+            self.over_budget = 0
+        else:
+            # Comfortably inside the budget but without spare room: hold steady
+            self.over_budget = 0
+            self.under_budget = 0
+
+        if self.over_budget >= self.degrade_after and self.level < len(QUALITY_LEVELS) - 1:
+            return self.set_level(self.level + 1)
+        if self.under_budget >= self.restore_after and self.level > 0:
+            return self.set_level(self.level - 1)
+        return False
+
+    def set_level(self, level):
+        self.level = level
+        self.over_budget = 0
+        self.under_budget = 0
+        self.publish()
+        for listener in self.listeners:
+            listener(self.settings)
+        return True
+
+    def publish(self):
+        self.profiler.set_value("quality", self.settings["name"])
+
+class FramePacer:
+    def __init__(self, clock, max_fps=0, busy_loop=False):
+        self.clock = clock
+        self.max_fps = max_fps
+        self.busy_loop = busy_loop
+
+    def tick(self):
+        # tick_busy_loop spins instead of sleeping, so frames land on time to the
+        # millisecond at the cost of a busy core; 0 means no cap either way
+        if self.busy_loop:
+            return self.clock.tick_busy_loop(self.max_fps)
+        return self.clock.tick(self.max_fps)
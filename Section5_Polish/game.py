@@ -6,205 +6,311 @@ Adds final polish to the Pong clone:
 - Helper UI text and modifier controls for paddle/ball speeds.
 - Live readouts for CPU, Player, and Ball speeds.
 - Win condition (first to 3) with results screen and restart.
+- Cached text rendering (TextCache) so static strings are only rendered once.
+- Pre-composited static layer per state (StaticLayer), blitted in one call.
+- Images, sounds and fonts come from a shared, lazily loaded AssetManager.
+- Loading state: menu art and audio decode on background threads while a
+  progress bar shows; the menu appears as soon as its own art is ready.
+- Optional replay recording (seed + per-tick inputs) via replay.py.
+- Optional two-player netplay: a RollbackSession (netplay.py) steps the
+  match with this machine's keys on one paddle and the peer's on the other.
+- Multi-ball ("chaos") mode: extra balls live in an array-backed BallPool.
+- Thin frontend over the headless Match engine (engine.py): Game turns
+  pygame input into engine Inputs, and plays audio / draws as an observer.
+- Sound effects go through an AudioService (audio.py): events are queued
+  during physics and started once per frame by play_audio().
+- Background music is streamed by a MusicPlayer (audio.py), fading to the
+  track for each state (MUSIC_TRACKS) on start_game / match_over / return_to_menu.
+- Every draw_* helper is timed by the frame profiler (profiler.py) when one is passed in.
 """
 
 import pygame
+from engine import Match
 from ball import Ball
 from player import Player
 from opponent import Opponent
+from text_cache import TextCache
+from static_layer import StaticLayer
+from asset_manager import shared_assets
+from replay import ReplayRecorder, MAX_PRESSES
+from profiler import NULL_PROFILER, profiled
+from audio import AudioService, MusicPlayer, SOUND_FILES
+
+# Maps pygame keys to the key names the engine understands
+KEY_NAMES = {
+    pygame.K_1: "1", pygame.K_2: "2", pygame.K_3: "3", pygame.K_4: "4",
+    pygame.K_5: "5", pygame.K_6: "6", pygame.K_7: "7", pygame.K_8: "8",
+    pygame.K_SPACE: "space",
+}
+
+# Streamed background music per game state (None = silence); .ogg / .mp3 work too
+MUSIC_TRACKS = {
+    "menu": None,
+    "game": "assets/music.wav",
+    "game_results": None,
+}
+MUSIC_EVENTS = ("start_game", "match_over", "return_to_menu")
+MENU_IMAGES = ("assets/background.png", "assets/logo.png")
 
 class Game:
-    def __init__(self):        
-        # == Audio ==
-        self.lose_point = pygame.mixer.Sound("assets/lose_point.wav")
-        self.win_point = pygame.mixer.Sound("assets/win_point.wav")
-        self.music = pygame.mixer.Sound("assets/music.wav")
+    def __init__(self, assets=shared_assets, preload=True, record=False, profiler=None, **match_options):        
+        # match_options go straight to engine.Match (collision, seed, opponent_strategy, ...)
+        # == Assets (sounds and menu art load lazily on first use; music streams) ==
+        self.assets = assets
+
+        # == Background Loading ==
+        # The menu shows as soon as its own art is decoded; audio keeps loading behind it
+        self.loading = preload
+        if preload:
+            self.progress_bar = pygame.Surface((400, 12))
+            self.progress_bar.fill((200,200,200))
+            self.menu_assets = assets.preload(images=MENU_IMAGES)
+            self.game_assets = assets.preload(sounds=SOUND_FILES.values())
         
         # == Fonts ==
-        self.font = pygame.font.Font(None, 74)   # Main score font
-        self.font_small = pygame.font.Font(None, 28) # UI/helper font
-
-        # == Game State ==
-        self.game_state = "menu"
-
-        # == Assets ==
-        ball_surface = pygame.image.load("../assets/blue_ball.png").convert_alpha()
-        self.ball = Ball(
-            surface = ball_surface,
-            x_position = 1280 // 2,
-            y_position = 720 // 2,
-            x_speed = 8,
-            y_speed = 8
-        )
-        
-        player_paddle_surface = pygame.image.load("../assets/blue_paddle.png").convert_alpha()
-        self.player = Player(
-            surface = player_paddle_surface,
-            starting_x_position = 10,
-            starting_y_position = 720 // 2,
-            speed = 10
-        )
-        
-        opponent_paddle_surface = pygame.transform.flip(
-            pygame.image.load("../assets/blue_paddle.png").convert_alpha(), 
-            True, False
-        )
-        self.opponent = Opponent(
-            surface = opponent_paddle_surface,
-            starting_x_position = 1280 - 10,
-            starting_y_position = 720 // 2,
-            speed = 10
+        self.font = assets.font(None, 74)        # Main score font
+        self.font_small = assets.font(None, 28)  # UI/helper font
+        self.text_cache = TextCache()                # Rendered text surfaces
+        self.static_layer = StaticLayer()            # Pre-composited background per state
+
+        # == Sprite Images ==
+        ball_surface = assets.image("../assets/blue_ball.png")
+        player_paddle_surface = assets.image("../assets/blue_paddle.png")
+        opponent_paddle_surface = assets.image("../assets/blue_paddle.png", flip_x=True)
+
+        # == Simulation ==
+        self.match = Match(
+            ball_size = ball_surface.get_size(),
+            paddle_size = player_paddle_surface.get_size(),
+            **match_options
         )
-        
-        self.background = pygame.image.load("assets/background.png").convert_alpha()
-        self.logo = pygame.image.load("assets/logo.png").convert_alpha()
+        self.match.add_observer(self.on_match_event)
+        self.profiler = profiler or NULL_PROFILER
+        self.match.profiler = self.profiler
+        self.recorder = ReplayRecorder(self.match) if record else None
+        self.netplay = None   # A netplay.RollbackSession steps the match instead, when set
+        self.stalled_presses = ()  # Presses a stalled netplay tick didn't take, retried next tick
+        self.audio = AudioService(assets)
+        self.music = MusicPlayer(assets)
+        self.music.play(MUSIC_TRACKS["menu"])
+
+        # == Sprites ==
+        self.ball = Ball(ball_surface, self.match.ball)
+        self.player = Player(player_paddle_surface, self.match.player)
+        self.opponent = Opponent(opponent_paddle_surface, self.match.opponent)
+
+    # == Match State ==
+    @property
+    def game_state(self):
+        return "loading" if self.loading else self.match.game_state
 
-        # == Scores ==
-        self.player_score = 0
-        self.opponent_score = 0
+    @property
+    def player_score(self):
+        return self.match.player_score
+
+    @property
+    def opponent_score(self):
+        return self.match.opponent_score
         
     def run(self, events, screen):
         self.update(events)
+        self.play_audio()
         self.draw(screen)
         
     def update(self, events):
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                self.handle_keydown(event)
-                
-        if self.game_state == "game":
-            self.ball.update(self.player, self.opponent)
-            self.player.update(events)
-            self.opponent.update(self.ball)
-
-            # == Scoring ==
-            if self.ball.rect.left < 0:
-                self.opponent_score += 1
-                pygame.mixer.Sound.play(self.lose_point)
-                self.ball.reset()
-            elif self.ball.rect.right > 1280:
-                self.player_score += 1
-                pygame.mixer.Sound.play(self.win_point)
-                self.ball.reset()
-                
-            # == Win Condition ==
-            if self.player_score == 3 or self.opponent_score == 3:
-                self.game_state = "game_results"
-    
-    def handle_keydown(self, event):
-        # == Navigation ==
-        if event.key == pygame.K_1 and self.game_state != "menu":
-            self.return_to_menu()
-        
-        if event.key == pygame.K_2 and self.game_state != "game":
-            self.start_game()
-        
-        if not self.ball.active and event.key == pygame.K_SPACE:
-            self.ball.start()
-        
-        # == Opponent Speed ==
-        if event.key == pygame.K_3:
-            self.opponent.speed = max(4, self.opponent.speed - 1)
-        if event.key == pygame.K_4:
-            self.opponent.speed = min(16, self.opponent.speed + 1)
-
-        # == Player Speed ==
-        if event.key == pygame.K_5:
-            self.player.speed = max(4, self.player.speed - 1)
-        if event.key == pygame.K_6:
-            self.player.speed = min(16, self.player.speed + 1)
-
-        # == Ball Speed (handle signs correctly) ==
-        if event.key == pygame.K_7:
-            self.ball.x_speed = max(4, abs(self.ball.x_speed) - 1) * (1 if self.ball.x_speed >= 0 else -1)
-            self.ball.y_speed = max(4, abs(self.ball.y_speed) - 1) * (1 if self.ball.y_speed >= 0 else -1)
-        if event.key == pygame.K_8:
-            self.ball.x_speed = min(16, abs(self.ball.x_speed) + 1) * (1 if self.ball.x_speed >= 0 else -1)
-            self.ball.y_speed = min(16, abs(self.ball.y_speed) + 1) * (1 if self.ball.y_speed >= 0 else -1)
-    
-    def return_to_menu(self):
-        self.game_state = "menu"
-        self.music.stop()
-        self.ball.active = False
-        self.player_score = 0
-        self.opponent_score = 0
-    
-    def start_game(self):
-        self.game_state = "game"
-        self.music.play(loops=-1)
+        self.assets.poll()
+        if self.loading:
+            self.loading = not self.menu_assets.ready
+            return
+
+        presses = tuple(
+            KEY_NAMES[event.key] for event in events
+            if event.type == pygame.KEYDOWN and event.key in KEY_NAMES
+        )
+        inputs = self.player.read_input(self.stalled_presses + presses)
+        if self.netplay:
+            # A stalled session drops the tick's input, so hold on to its presses until one is taken
+            accepted = self.netplay.step(inputs)
+            self.stalled_presses = () if accepted else inputs.presses[:MAX_PRESSES]
+        elif self.recorder:
+            self.recorder.step(inputs)
+        else:
+            self.match.step(inputs)
+
+    def on_match_event(self, event, match):
+        # == Audio Observer ==
+        # Sound effects only queue here; play_audio() starts them once per frame
+        self.audio.play(event)
+        if event in MUSIC_EVENTS:
+            self.music.play(MUSIC_TRACKS[match.game_state])
+
+    def use_match(self, match):
+        # Swap in another Match (e.g. a replay viewer's); sprites and observers follow it
+        if self.recorder or self.netplay:
+            # Both are tied to the match they started with
+            raise ValueError("Can't swap the match while recording a replay or in netplay")
+        self.match.remove_observer(self.on_match_event)
+        self.match = match
+        match.add_observer(self.on_match_event)
+        match.profiler = self.profiler
+        self.ball.body, self.player.body, self.opponent.body = match.ball, match.player, match.opponent
+        self.static_layer.invalidate()   # "First to N Wins" may have changed
+
+    def play_audio(self):
+        self.audio.flush()
+        self.music.update()
+
+    def apply_quality(self, settings):
+        # Called by frame_pacing.QualityController when the quality level changes
+        if self.text_cache.antialias != settings["antialias"]:
+            self.text_cache.antialias = settings["antialias"]
+            self.static_layer.invalidate()   # Static text was rendered with the old setting
 
     # ================= Draw Methods ================= #
-    def draw(self, screen):
-        if self.game_state == "menu":
-            screen.blit(self.background, (0,0))
+    def draw(self, screen, alpha=1.0):
+        # alpha: how far (0-1) the render time is between the last two ticks
+        screen.blit(self.get_static_layer(screen), (0,0))
+        self.draw_sprites(screen, alpha)
+        self.publish_stats()
+
+    def draw_dirty(self, renderer, alpha=1.0):
+        # Dirty-rect path: the static layer doubles as the restore background
+        renderer.set_background(self.get_static_layer(renderer.screen))
+        renderer.begin()
+        self.draw_sprites(renderer, alpha)
+        self.publish_stats()
+
+    def publish_stats(self):
+        # Text cache hits / misses for the profiler overlay (F3)
+        if self.profiler.enabled:
+            self.profiler.set_value("text cache", self.text_cache.stats_text())
+
+    def get_static_layer(self, screen):
+        size = screen.get_size()
+        return self.static_layer.get((self.game_state, size), size, self.draw_static)
+
+    @profiled
+    def draw_static(self, screen):
+        # Everything that stays put while a state is active (cached in static_layer)
+        if self.game_state == "loading":
+            screen.fill((32,42,68))
+            pygame.draw.rect(screen, (90,90,90), pygame.Rect(1280/2 - 200, 720/2 + 30, 400, 12))
+
+        elif self.game_state == "menu":
+            screen.blit(self.assets.image("assets/background.png"), (0,0))
             self.draw_logo(screen)
             self.draw_main_start_text(screen)
             
         elif self.game_state == "game":
             screen.fill((32,42,68)) 
-            self.ball.draw(screen) 
-            self.player.draw(screen)  
-            self.opponent.draw(screen)  
             pygame.draw.rect(screen, (90,90,90), pygame.Rect((1280 // 2) - 2, 0, 4, 720))
-            self.draw_player_score(screen)
-            self.draw_opponent_score(screen)
+            self.draw_obstacles(screen)
             self.draw_score_helper(screen)
             self.draw_game_menu_hint(screen)
-            self.draw_modifier_info(screen)
             self.draw_modifier_helper(screen)
                 
         elif self.game_state == "game_results":
             screen.fill((32,42,68)) 
-            self.draw_results_helper(screen)
             self.draw_results_hint(screen)
+
+    @profiled
+    def draw_sprites(self, screen, alpha=1.0):
+        # Moving objects and text that can change from frame to frame
+        if self.game_state == "loading":
+            self.draw_loading_progress(screen)
+
+        elif self.game_state == "game":
+            self.ball.draw(screen, alpha) 
+            self.draw_ball_pool(screen, alpha)
+            self.player.draw(screen, alpha)  
+            self.opponent.draw(screen, alpha)  
+            self.draw_player_score(screen)
+            self.draw_opponent_score(screen)
+            self.draw_modifier_info(screen)
+                
+        elif self.game_state == "game_results":
+            self.draw_results_helper(screen)
     
+    # == Loading Helpers == #
+    @profiled
+    def draw_loading_progress(self, screen):
+        progress = self.menu_assets.progress
+        # Only blit as much of the full bar as has loaded (the empty bar is in the static layer)
+        screen.blit(self.progress_bar, (1280/2 - 200, 720/2 + 30), pygame.Rect(0, 0, round(400 * progress), 12))
+        loading_text = self.text_cache.render(self.font_small, f"Loading... {round(progress * 100)}%", (200, 200, 200))
+        loading_rect = loading_text.get_rect(center=(1280/2, 720/2))
+        screen.blit(loading_text, loading_rect)
+
     # == Menu Helpers == #        
+    @profiled
     def draw_logo(self, screen):
-        logo_rect = self.logo.get_rect(center=(1280/2,720/3))
-        screen.blit(self.logo, logo_rect)
+        logo = self.assets.image("assets/logo.png")
+        logo_rect = logo.get_rect(center=(1280/2,720/3))
+        screen.blit(logo, logo_rect)
     
+    @profiled
     def draw_main_start_text(self, screen):
-        press_start_text = self.font.render("Press [2] to Start", True, (255, 255, 255))
+        press_start_text = self.text_cache.render(self.font, "Press [2] to Start", (255, 255, 255))
         press_start_rect = press_start_text.get_rect(center=(1280 / 2,720 / 2))
         screen.blit(press_start_text, press_start_rect)
     
     # == Game Helpers == #
+    @profiled
+    def draw_ball_pool(self, screen, alpha):
+        if self.match.ball_pool:
+            image = self.ball.image
+            for position in self.match.ball_pool.interpolated_positions(alpha):
+                screen.blit(image, position)
+
+    @profiled
+    def draw_obstacles(self, screen):
+        for box in self.match.obstacles:
+            pygame.draw.rect(screen, (90,90,90), pygame.Rect(box))
+
+    @profiled
     def draw_score_helper(self, screen):
-        score_text = "First to 3 Wins"
-        score_surface = self.font_small.render(score_text, True, (200, 200, 200))
+        score_text = f"First to {self.match.win_score} Wins"
+        score_surface = self.text_cache.render(self.font_small, score_text, (200, 200, 200))
         screen.blit(score_surface, (1280/2 + 30, 20))
     
+    @profiled
     def draw_game_menu_hint(self, screen):
-        menu_hint = self.font_small.render("[1] Menu", True, (200, 200, 200))
+        menu_hint = self.text_cache.render(self.font_small, "[1] Menu", (200, 200, 200))
         screen.blit(menu_hint, (1280 - menu_hint.get_width() - 12, 12))
 
+    @profiled
     def draw_modifier_info(self, screen):
-        vals_text = f"CPU: {self.opponent.speed}   Player: {self.player.speed}   Ball: X:{abs(self.ball.x_speed)}/Y:{abs(self.ball.y_speed)}"
-        vals_surface = self.font_small.render(vals_text, True, (185, 185, 185))
+        match = self.match
+        vals_text = f"CPU: {match.opponent.speed}   Player: {match.player.speed}   Ball: X:{abs(match.ball.x_speed)}/Y:{abs(match.ball.y_speed)}"
+        vals_surface = self.text_cache.render(self.font_small, vals_text, (185, 185, 185))
         screen.blit(vals_surface, (10, 664))
     
+    @profiled
     def draw_modifier_helper(self, screen):
         helper_text = "[3/4] Opponent Speed +/- | [5/6] Player Speed +/- | [7/8] Ball Speed +/-"
-        helper_surface = self.font_small.render(helper_text, True, (200, 200, 200))
+        helper_surface = self.text_cache.render(self.font_small, helper_text, (200, 200, 200))
         screen.blit(helper_surface, (10, 690))
                 
+    @profiled
     def draw_player_score(self, screen):
-        player_score_text = self.font.render(str(self.player_score), True, (255, 255, 255))
+        player_score_text = self.text_cache.render(self.font, str(self.player_score), (255, 255, 255))
         player_score_rect = player_score_text.get_rect(center=(1280//4, 50))
         screen.blit(player_score_text, player_score_rect)
 
+    @profiled
     def draw_opponent_score(self, screen):
-        opponent_score_text = self.font.render(str(self.opponent_score), True, (255, 255, 255))
+        opponent_score_text = self.text_cache.render(self.font, str(self.opponent_score), (255, 255, 255))
         opponent_score_rect = opponent_score_text.get_rect(center=(1280*3//4, 50))
         screen.blit(opponent_score_text, opponent_score_rect)
 
     # == Results Helpers == #
+    @profiled
     def draw_results_helper(self, screen):
-        winner = "Player" if self.player_score == 3 else "CPU"
-        helper_surface = self.font_small.render(f"{winner} Won", True, (200, 200, 200))
+        helper_surface = self.text_cache.render(self.font_small, f"{self.match.winner} Won", (200, 200, 200))
         helper_rect = helper_surface.get_rect(center=(1280/2, 720/2))
         screen.blit(helper_surface, helper_rect)
         
+    @profiled
     def draw_results_hint(self, screen):
-        menu_hint = self.font_small.render("[1] Menu", True, (200, 200, 200))
+        menu_hint = self.text_cache.render(self.font_small, "[1] Menu", (200, 200, 200))
         screen.blit(menu_hint, (1280 - menu_hint.get_width() - 12, 12))
\ No newline at end of file
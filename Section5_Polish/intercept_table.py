@@ -0,0 +1,124 @@
+"""
+Intercept Table
+
+Precomputed lookup table of where the ball will reach the CPU paddle.
+
+- Generated offline by stepping the real ball rules (move, clamp to the wall,
+  flip y speed) for every quantized ball position and velocity at once with NumPy.
+- Saved as a .npy file and opened with mmap_mode="r" at startup, so only the
+  pages that are actually looked up are ever read from disk. The file is
+  written to a temporary name and renamed into place, so another process
+  can never map a half-written table.
+- lookup() is a handful of integer operations, so the "table" opponent
+  strategy costs nothing per frame beyond moving the paddle.
+- DIFFICULTY_TIERS layer latency (reaction delay) and noise (aim error) over
+  the table, so the CPU's difficulty is data, not code.
+
+Run this file directly to (re)build the table:
+    python intercept_table.py
+"""
+
+import os
+import tempfile
+import numpy as np
+from engine import SCREEN_WIDTH, SCREEN_HEIGHT, BALL_SIZE, PADDLE_SIZE
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intercept_table.npy")
+
+# == Quantization ==
+X_STEP = 32                               # Ball x bucket size in px
+Y_STEP = 16                               # Ball y bucket size in px
+SPEEDS = np.arange(4, 17)                 # |speed| range the modifier keys allow
+X_BINS = SCREEN_WIDTH // X_STEP
+Y_BINS = SCREEN_HEIGHT // Y_STEP
+
+# Ball x at which its right edge first touches the CPU paddle's left edge
+TARGET_X = SCREEN_WIDTH - 10 - PADDLE_SIZE[0] // 2 - BALL_SIZE[0]
+
+# Tier name -> (paddle speed, reaction delay in ticks, aim error in px)
+DIFFICULTY_TIERS = {
+    "easy": (6, 18, 90),
+    "normal": (10, 8, 45),
+    "hard": (13, 3, 15),
+    "perfect": (16, 0, 0),
+}
+
+def build_table():
+    """Ball centre y on reaching TARGET_X for every (x bin, y bin, x speed, y speed)."""
+    ball_width, ball_height = BALL_SIZE
+    y_speeds = np.concatenate((-SPEEDS[::-1], SPEEDS))
+    shape = (X_BINS, Y_BINS, len(SPEEDS), len(y_speeds))
+
+    # Start every ball at the centre of its bucket (top-left coordinates)
+    x = np.broadcast_to((np.arange(X_BINS) * X_STEP + X_STEP // 2 - ball_width // 2)[:, None, None, None], shape).astype(np.int32)
+    y = np.broadcast_to((np.arange(Y_BINS) * Y_STEP + Y_STEP // 2 - ball_height // 2)[None, :, None, None], shape).astype(np.int32)
+    y = np.clip(y, 0, SCREEN_HEIGHT - ball_height)
+    x_speed = np.broadcast_to(SPEEDS[None, None, :, None], shape).astype(np.int32)
+    y_speed = np.broadcast_to(y_speeds[None, None, None, :], shape).astype(np.int32).copy()
+
+    result = np.where(x > TARGET_X, y, -1)
+    pending = result < 0
+
+    # Same rules as BallBody.move / check_collisions, applied to every entry per tick
+    while pending.any():
+        x = x + x_speed
+        y = y + y_speed
+        top = y <= 0
+        bottom = y + ball_height >= SCREEN_HEIGHT
+        y = np.where(top, 0, np.where(bottom, SCREEN_HEIGHT - ball_height, y))
+        y_speed = np.where(top | bottom, -y_speed, y_speed)
+
+        arrived = pending & (x > TARGET_X)
+        result[arrived] = y[arrived]
+        pending &= ~arrived
+
+    return (result + ball_height // 2).astype(np.int16)
+
+def save_table(path=TABLE_PATH):
+    table = build_table()
+    # Write next to the final path, then rename: readers see the old file or the whole new one
+    descriptor, temp_path = tempfile.mkstemp(suffix=".npy", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            np.save(file, table)
+        os.chmod(temp_path, 0o644)   # mkstemp creates the file private to this user
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return table
+
+class InterceptTable:
+    def __init__(self, path=TABLE_PATH, build_if_missing=True):
+        if not os.path.exists(path) and build_if_missing:
+            save_table(path)
+        self.table = np.load(path, mmap_mode="r")
+
+        expected = (X_BINS, Y_BINS, len(SPEEDS), 2 * len(SPEEDS))
+        if self.table.shape != expected:
+            raise ValueError(f"Intercept table has shape {self.table.shape}, expected {expected}; rebuild it")
+
+    def lookup(self, x, y, x_speed, y_speed):
+        """Ball centre y when it reaches the CPU paddle, for a ball moving right."""
+        x_bin = min(max(int(x + BALL_SIZE[0] // 2) // X_STEP, 0), X_BINS - 1)
+        y_bin = min(max(int(y + BALL_SIZE[1] // 2) // Y_STEP, 0), Y_BINS - 1)
+
+        last = len(SPEEDS) - 1
+        x_index = min(max(abs(x_speed) - SPEEDS[0], 0), last)
+        y_index = min(max(abs(y_speed) - SPEEDS[0], 0), last)
+        y_index = last - y_index if y_speed < 0 else len(SPEEDS) + y_index
+        return int(self.table[x_bin, y_bin, x_index, y_index])
+
+def tier_settings(tier):
+    """Match keyword arguments for a difficulty tier using the table opponent."""
+    speed, reaction_delay, aim_error = DIFFICULTY_TIERS[tier]
+    return {
+        "opponent_strategy": "table",
+        "opponent_speed": speed,
+        "reaction_delay": reaction_delay,
+        "aim_error": aim_error,
+    }
+
+if __name__ == "__main__":
+    table = save_table()
+    print(f"Wrote {TABLE_PATH}: shape {table.shape}, {table.nbytes // 1024} KB")
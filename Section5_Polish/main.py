@@ -12,10 +12,38 @@ Press 1 to switch to the Menu state.
 Press 2 to start the Game state.
 Press SPACE to launch the ball once the game has begun.
 Use keys [3–8] to adjust CPU, Player, and Ball speeds in real-time.
+Press F3 to show the frame profiler overlay, F4 to save a Chrome trace of it.
+
+The loop uses a fixed timestep: physics (Game.update) always runs at TICK_RATE
+ticks per second, no matter how fast or slow frames are rendered. Leftover time
+is passed to Game.draw so the ball and paddles are interpolated between ticks.
 """
 
+import time
 import pygame
 from game import Game
+from dirty_rect import DirtyRectRenderer
+from profiler import FrameProfiler
+from profiler_overlay import ProfilerOverlay
+from frame_pacing import QualityController, FramePacer
+from netplay import UdpTransport, RollbackSession
+
+TICK_RATE = 60         # Physics ticks per second (speeds are pixels per tick)
+MAX_FPS = 0            # Render cap, 0 = uncapped
+BUSY_LOOP = False      # Pace frames with Clock.tick_busy_loop (precise, but keeps a core busy)
+ADAPTIVE_QUALITY = True  # Drop optional work (text antialiasing, overlay refreshes, interpolation) when frames run long
+MAX_FRAME_TIME = 0.25  # Longest frame we catch up on, avoids a "spiral of death"
+COLLISION = "discrete" # "swept" = continuous collision, safe for very fast balls
+DIRTY_RECTS = False    # Only update the changed parts of the screen
+REPLAY_PATH = None     # e.g. "last_match.pongreplay" to record the session
+OPPONENT_STRATEGY = "chase"  # "predict" = CPU works out where the ball will arrive
+REACTION_DELAY = 6     # Ticks a predicting CPU waits before reacting to a bounce
+AIM_ERROR = 40         # Max pixels a predicting CPU misjudges the intercept by
+DIFFICULTY = None      # "easy" / "normal" / "hard" / "perfect": table-driven CPU (overrides the three above)
+EXTRA_BALLS = 0        # Multi-ball "chaos" mode: extra balls served alongside the main one
+WIN_SCORE = 3          # Points needed to win a match
+NETPLAY = None         # e.g. {"side": "left", "port": 7777, "peer": ("192.168.1.20", 7777), "seed": 1234}
+PROFILE_TRACE_PATH = "profile_trace.json"  # Where F4 writes the profiler's Chrome trace
 
 def main():
     pygame.mixer.pre_init(44100, -16, 2, 512)
@@ -24,18 +52,108 @@ def main():
     screen = pygame.display.set_mode((1280, 720))
     clock = pygame.time.Clock()
     running = True
-    game = Game()
+    opponent_options = {
+        "opponent_strategy": OPPONENT_STRATEGY,
+        "reaction_delay": REACTION_DELAY,
+        "aim_error": AIM_ERROR,
+    }
+    if DIFFICULTY:
+        from intercept_table import InterceptTable, tier_settings  # Needs NumPy, only load it when used
+        opponent_options = tier_settings(DIFFICULTY)
+        opponent_options["intercept_table"] = InterceptTable()
+
+    if NETPLAY:
+        # Both peers must use the same seed; the CPU paddle becomes the remote player's
+        opponent_options = {"opponent_strategy": "remote", "seed": NETPLAY["seed"]}
+
+    profiler = FrameProfiler()
+    game = Game(
+        record = REPLAY_PATH is not None and not NETPLAY,
+        profiler = profiler,
+        collision = COLLISION,
+        extra_balls = EXTRA_BALLS,
+        win_score = WIN_SCORE,
+        **opponent_options
+    )
+    if NETPLAY:
+        transport = UdpTransport(("0.0.0.0", NETPLAY["port"]), NETPLAY["peer"])
+        game.netplay = RollbackSession(game.match, NETPLAY["side"], transport)
+    renderer = DirtyRectRenderer(screen) if DIRTY_RECTS else None
+    overlay = ProfilerOverlay(profiler, game.assets.font(None, 22))
+    quality = QualityController(budget=1 / TICK_RATE, profiler=profiler)
+    quality.add_listener(game.apply_quality)
+    quality.add_listener(overlay.apply_quality)
+    pacer = FramePacer(clock, MAX_FPS, BUSY_LOOP)
+
+    tick_time = 1 / TICK_RATE
+    accumulator = 0.0
+    pending_events = []   # Events wait here until the next physics tick
+    previous_time = time.perf_counter()
     
     while running:
-        events = pygame.event.get()
-        for event in events:
-            if event.type == pygame.QUIT:
-                running = False
+        profiler.begin_frame()
+        current_time = time.perf_counter()
+        accumulator += min(current_time - previous_time, MAX_FRAME_TIME)
+        previous_time = current_time
+
+        with profiler.section("events"):
+            events = pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    overlay.toggle()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                    profiler.export_chrome_trace(PROFILE_TRACE_PATH)
+            pending_events.extend(events)
+
+        # == Fixed Timestep Physics ==
+        ticked = False
+        while accumulator >= tick_time:
+            with profiler.section("update"):
+                game.update(pending_events)
+            pending_events = []
+            accumulator -= tick_time
+            ticked = True
+        with profiler.section("audio"):
+            game.play_audio()
+
+        # == Interpolated Render ==
+        # At the lowest quality, frames without a new tick aren't drawn at all
+        interpolate = quality.settings["interpolate"]
+        drew = ticked or interpolate
+        if drew:
+            alpha = accumulator / tick_time if interpolate else 1.0
+            if renderer:
+                with profiler.section("draw"):
+                    game.draw_dirty(renderer, alpha)
+                    overlay.draw(renderer)
+                with profiler.section("flip"):
+                    renderer.present()
+            else:
+                with profiler.section("draw"):
+                    game.draw(screen, alpha)
+                    overlay.draw(screen)
+                with profiler.section("flip"):
+                    pygame.display.flip()
 
-        game.run(events, screen)
-        pygame.display.flip()
-        clock.tick(60)
+        # == Frame Pacing ==
+        if drew:
+            if ADAPTIVE_QUALITY:
+                quality.update(time.perf_counter() - current_time)
+            with profiler.section("idle"):
+                pacer.tick()
+        else:
+            # Nothing to draw before the next tick: sleep until then rather than spin, and
+            # don't report this empty frame to the controller as headroom
+            with profiler.section("idle"):
+                time.sleep(max(0.0, tick_time - accumulator))
+        profiler.end_frame()
 
+    if game.recorder:
+        game.recorder.save(REPLAY_PATH)
+    if game.netplay:
+        game.netplay.close()
     pygame.quit()
 
 if __name__ == "__main__":
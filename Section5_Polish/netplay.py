@@ -0,0 +1,262 @@
+"""
+Netplay
+
+Two-player Pong over UDP with input delay and rollback.
+
+- Each peer runs the full Match locally. One side ("left") controls the
+  player paddle, the other ("right") the opponent paddle, which uses
+  opponent_strategy="remote" so it follows the peer's inputs instead of the AI.
+- Local input is scheduled input_delay ticks ahead, which hides that much
+  latency completely.
+- When the remote input for a tick hasn't arrived yet, it's predicted (the
+  peer keeps holding whatever direction they last held) and the state
+  before the tick is snapshotted (Match.snapshot(), a small tuple of ints).
+- If a late input turns out different from the prediction, the session
+  restores the snapshot of that tick and re-simulates up to the present with
+  observers muted, so there are no duplicated sounds.
+- The session stalls rather than getting more than max_rollback ticks ahead
+  of the last confirmed remote input.
+- Every packet repeats all of the sender's inputs the peer hasn't acknowledged,
+  so lost packets cost nothing but a little latency. Malformed packets
+  (truncated, unknown key codes) are dropped whole.
+- Once every input before a tick is confirmed, that tick's snapshot is final;
+  its checksum goes into confirmed_checksums, so two peers can be compared
+  for desyncs.
+- SimulatedNetwork wraps a transport with artificial latency, jitter and
+  loss for testing over loopback.
+
+Packet layout (little-endian): ack (i32, highest remote tick received in
+order), first tick (i32), count (u8), then count inputs encoded as in replay.py.
+"""
+
+import heapq
+import random
+import socket
+import struct
+import time
+from engine import NO_INPUT, Inputs
+from replay import encode_inputs, decode_inputs, snapshot_checksum
+
+PACKET = struct.Struct("<iiB")
+MAX_INPUTS_PER_PACKET = 255
+CHECKSUM_HISTORY = 600
+
+class UdpTransport:
+    def __init__(self, local_address, remote_address):
+        host, port = remote_address
+        self.remote_address = (socket.gethostbyname(host), port)   # recvfrom reports numeric addresses
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(local_address)
+        self.socket.setblocking(False)
+
+    def send(self, data):
+        try:
+            self.socket.sendto(data, self.remote_address)
+        except OSError:
+            pass   # Peer not up yet (e.g. ICMP port unreachable); the next packet repeats everything
+
+    def receive(self):
+        packets = []
+        while True:
+            try:
+                data, address = self.socket.recvfrom(2048)
+            except (BlockingIOError, ConnectionError):
+                break
+            if address == self.remote_address:
+                packets.append(data)
+        return packets
+
+    def close(self):
+        self.socket.close()
+
+class SimulatedNetwork:
+    """Adds latency (seconds each way), jitter and packet loss to another transport's sends."""
+    def __init__(self, transport, latency=0.05, jitter=0.01, loss=0.05, seed=None):
+        self.transport = transport
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.in_flight = []   # Heap of (delivery time, sequence, data)
+        self.sequence = 0
+
+    def send(self, data):
+        if self.rng.random() < self.loss:
+            return
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        heapq.heappush(self.in_flight, (time.perf_counter() + delay, self.sequence, data))
+        self.sequence += 1
+
+    def receive(self):
+        self.flush()
+        return self.transport.receive()
+
+    def flush(self):
+        now = time.perf_counter()
+        while self.in_flight and self.in_flight[0][0] <= now:
+            self.transport.send(heapq.heappop(self.in_flight)[2])
+
+    def close(self):
+        self.transport.close()
+
+def same_inputs(a, b):
+    return a.up == b.up and a.down == b.down and a.presses == b.presses
+
+class RollbackSession:
+    def __init__(self, match, side, transport, input_delay=2, max_rollback=8):
+        if side not in ("left", "right"):
+            raise ValueError(f"side must be 'left' or 'right', not {side!r}")
+        if match.opponent.strategy != "remote":
+            raise ValueError('Netplay needs a Match with opponent_strategy="remote"')
+        if match.tick != 0:
+            raise ValueError("Netplay must start from a fresh Match")
+        if input_delay < 1:
+            # Predictions start from the last confirmed remote input, so at least one tick must be known
+            raise ValueError(f"input_delay must be at least 1 tick, not {input_delay}")
+        self.match = match
+        self.side = side
+        self.transport = transport
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+
+        # == Inputs by tick ==
+        # Nobody can have input for the first input_delay ticks, so both sides agree they're empty
+        self.local_inputs = {tick: NO_INPUT for tick in range(input_delay)}
+        self.remote_inputs = {tick: NO_INPUT for tick in range(input_delay)}
+        self.predicted = {}          # Tick -> remote input guessed when it was simulated
+        self.snapshots = {}          # Tick -> Match.snapshot() taken just before simulating it
+        self.remote_confirmed = input_delay - 1   # Every remote input up to here is known
+        self.local_acked = input_delay - 1        # The peer has every local input up to here
+        self.first_misprediction = None
+        self.confirmed_checksums = {}   # Tick -> checksum of the final state before that tick
+
+        # == Stats ==
+        self.rollbacks = 0
+        self.rollback_ticks = 0
+        self.stalls = 0
+        self.packets_sent = 0
+        self.packets_received = 0
+
+    @property
+    def tick(self):
+        return self.match.tick
+
+    def step(self, inputs):
+        """Advance one tick with this peer's input; returns False if stalled waiting for the peer."""
+        self.poll()
+        if self.tick - self.remote_confirmed > self.max_rollback:
+            self.stalls += 1
+            self.send()
+            return False
+
+        self.local_inputs[self.tick + self.input_delay] = inputs
+        self.send()
+        self.rollback()
+        self.simulate_tick()
+        self.discard_history()
+        return True
+
+    # == Simulation ==
+    def simulate_tick(self):
+        match = self.match
+        tick = match.tick
+        self.snapshots[tick] = match.snapshot()
+
+        remote = self.remote_inputs.get(tick)
+        if remote is None:
+            remote = self.predict()
+            self.predicted[tick] = remote
+
+        local = self.local_inputs[tick]
+        if self.side == "left":
+            match.step(local, remote)
+        else:
+            match.step(remote, local)
+
+    def predict(self):
+        # The peer most likely still holds the same direction (presses don't repeat)
+        last = self.remote_inputs[self.remote_confirmed]
+        return Inputs(last.up, last.down)
+
+    def rollback(self):
+        start = self.first_misprediction
+        if start is None:
+            return
+        self.first_misprediction = None
+
+        # Re-simulate from the first wrong guess without triggering sounds or other observers
+        end = self.tick
+        match = self.match
+        match.restore(self.snapshots[start])
+        observers, match.observers = match.observers, []
+        for _ in range(start, end):
+            self.simulate_tick()
+        match.observers = observers
+
+        self.rollbacks += 1
+        self.rollback_ticks += end - start
+
+    def discard_history(self):
+        # Rollbacks never go back past the last confirmed tick, unacknowledged local
+        # inputs are still needed for resending, and a peer that's ahead can confirm
+        # ticks this side hasn't simulated yet
+        oldest = min(self.remote_confirmed, self.local_acked + 1, self.tick)
+        for history in (self.local_inputs, self.remote_inputs):
+            for tick in [tick for tick in history if tick < oldest]:
+                del history[tick]
+        for tick in [tick for tick in self.snapshots if tick <= self.remote_confirmed]:
+            self.confirmed_checksums[tick] = snapshot_checksum(self.snapshots.pop(tick))
+            self.confirmed_checksums.pop(tick - CHECKSUM_HISTORY, None)
+
+    # == Network ==
+    def send(self):
+        first = self.local_acked + 1
+        last = min(max(self.local_inputs), first + MAX_INPUTS_PER_PACKET - 1)
+        body = b"".join(encode_inputs(self.local_inputs[tick]) for tick in range(first, last + 1))
+        self.transport.send(PACKET.pack(self.remote_confirmed, first, last - first + 1) + body)
+        self.packets_sent += 1
+
+    def poll(self):
+        for packet in self.transport.receive():
+            self.receive_packet(packet)
+
+    def receive_packet(self, packet):
+        if len(packet) < PACKET.size:
+            return
+        ack, first, count = PACKET.unpack_from(packet)
+
+        # Decode everything before using any of it: a truncated packet or unknown key code drops the whole packet
+        decoded = []
+        offset = PACKET.size
+        try:
+            for _ in range(count):
+                inputs, offset = decode_inputs(packet, offset)
+                decoded.append(inputs)
+        except IndexError:
+            return
+        if offset > len(packet):
+            return
+
+        self.packets_received += 1
+        # The peer can't have more local inputs than exist, and send() relies on that
+        self.local_acked = max(self.local_acked, min(ack, max(self.local_inputs)))
+
+        for tick, inputs in zip(range(first, first + count), decoded):
+            if tick <= self.remote_confirmed or tick in self.remote_inputs:
+                continue
+            self.remote_inputs[tick] = inputs
+
+            guess = self.predicted.pop(tick, None)
+            if guess is not None and not same_inputs(guess, inputs):
+                if self.first_misprediction is None or tick < self.first_misprediction:
+                    self.first_misprediction = tick
+
+        while self.remote_confirmed + 1 in self.remote_inputs:
+            self.remote_confirmed += 1
+
+    def stats_text(self):
+        return (f"Netplay: tick {self.tick}, confirmed {self.remote_confirmed}, "
+                f"{self.rollbacks} rollbacks ({self.rollback_ticks} ticks), {self.stalls} stalls")
+
+    def close(self):
+        self.transport.close()
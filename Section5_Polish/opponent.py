@@ -1,40 +1,21 @@
 """
 Opponent Paddle Class
 
-Handles the CPU-controlled paddle movement and boundary constraints.
+Draws the CPU-controlled paddle.
 
-- Follows the vertical position of the ball.
-- Simple AI: directly mirrors the ball’s Y position every frame.
-- Prevents the paddle from leaving the top or bottom of the screen.
-Difficulty scaling (slower reaction or capped speed) will be introduced in Section 5.
+- The AI itself lives in engine.py (OpponentBody): it follows the ball's
+  vertical position at a capped speed and stays inside the screen.
+- This class only holds the flipped paddle image and blits it at the body's position.
 """
 
 class Opponent():
-    def __init__(self, surface, starting_x_position, starting_y_position, speed):
+    def __init__(self, surface, body):
         self.image = surface
-        self.rect = self.image.get_rect(center=(
-            starting_x_position, 
-            starting_y_position
-        ))
+        self.body = body
 
-        self.speed = speed
-        
-    def update(self, ball):
-        if ball.x_speed == 0:
-            return
-        
-        # Movement
-        if self.rect.centery < ball.rect.centery:
-            self.rect.y += self.speed
-        elif self.rect.centery > ball.rect.centery:
-            self.rect.y -= self.speed
-                
-        # Boundary constraints
-        if self.rect.top <= 0:
-            self.rect.top = 0
-        if self.rect.bottom >= 720:
-            self.rect.bottom = 720
-        
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    @property
+    def rect(self):
+        return self.body.rect
 
+    def draw(self, screen, alpha=1.0):
+        screen.blit(self.image, self.body.interpolated_topleft(alpha))
@@ -1,40 +1,35 @@
 """
 Player Paddle Class
 
-Handles player-controlled paddle movement and boundary constraints.
+Reads the keyboard and draws the player paddle.
 Controlled via W/S or Up/Down keys.
 
 - Uses pygame.key.get_pressed() for smooth, continuous movement.
-- Prevents the paddle from leaving the top or bottom of the screen.
+- Movement and boundary constraints live in engine.py (PlayerBody);
+  this class turns the key state into engine Inputs and draws the paddle.
 """
 
 
 import pygame
+from engine import Inputs
 
 class Player():
-    def __init__(self, surface, starting_x_position, starting_y_position, speed):
+    def __init__(self, surface, body):
         self.image = surface
-        self.rect = self.image.get_rect(center=(
-            starting_x_position, 
-            starting_y_position
-        ))
-
-        self.speed = speed
-        
-    def update(self, events):
-        keys = pygame.key.get_pressed()
+        self.body = body
+
+    @property
+    def rect(self):
+        return self.body.rect
 
-        if keys[pygame.K_w] or keys[pygame.K_UP]:
-            self.rect.y -= self.speed
-        if keys[pygame.K_s] or keys[pygame.K_DOWN]:
-            self.rect.y += self.speed
+    def read_input(self, presses=()):
+        keys = pygame.key.get_pressed()
 
-        # Boundary constraints
-        if self.rect.top <= 0:
-            self.rect.top = 0
-        if self.rect.bottom >= 720:
-            self.rect.bottom = 720
-        
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+        return Inputs(
+            up = keys[pygame.K_w] or keys[pygame.K_UP],
+            down = keys[pygame.K_s] or keys[pygame.K_DOWN],
+            presses = presses
+        )
 
+    def draw(self, screen, alpha=1.0):
+        screen.blit(self.image, self.body.interpolated_topleft(alpha))
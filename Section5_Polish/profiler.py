@@ -0,0 +1,169 @@
+"""
+Frame Profiler
+
+Measures where each frame's time goes, with no pygame dependency.
+
+- Wrap work in `with profiler.section("name"):`; main.py times event
+  polling, Game.update, Game.draw, display.flip and the clock.tick idle time,
+  Match.step splits update into ball / player / opponent, and every Game
+  draw_* helper is timed through the @profiled decorator.
+- Section times are summed per frame (begin_frame / end_frame) and the last
+  `history` frames are kept for rolling mean / p50 / p95 / p99.
+- Every section is also kept as a timestamped span (up to `trace_spans`),
+  which export_chrome_trace() writes as Chrome trace JSON: open it in
+  chrome://tracing or https://ui.perfetto.dev to see individual stutters.
+- While disabled, section() hands back a shared no-op context, so leaving
+  the instrumentation in costs almost nothing. NULL_PROFILER is always off.
+
+The overlay that draws these numbers in-game lives in profiler_overlay.py.
+"""
+
+import json
+import time
+from collections import deque
+
+class _NoSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NO_SECTION = _NoSection()
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class FrameProfiler:
+    def __init__(self, history=600, trace_spans=50000, enabled=False):
+        self.enabled = enabled
+        self.frame_times = deque(maxlen=history)     # Seconds per frame
+        self.frame_sections = deque(maxlen=history)  # {section name: seconds} per frame
+        self.spans = deque(maxlen=trace_spans)       # (name, start, end) for the trace export
+        self.values = {}                             # Extra readouts shown on the overlay (e.g. quality level)
+        self.current = {}
+        self.frame_start = None
+        self.frame_count = 0
+
+    # == Recording ==
+    def section(self, name):
+        if not self.enabled:
+            return NO_SECTION
+        return _Section(self, name)
+
+    def record(self, name, start, end):
+        self.current[name] = self.current.get(name, 0.0) + (end - start)
+        self.spans.append((name, start, end))
+
+    def begin_frame(self):
+        self.current = {}
+        self.frame_start = time.perf_counter() if self.enabled else None
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        end = time.perf_counter()
+        self.frame_times.append(end - self.frame_start)
+        self.frame_sections.append(self.current)
+        self.spans.append(("frame", self.frame_start, end))
+        self.frame_count += 1
+        self.frame_start = None
+
+    def set_value(self, name, value):
+        self.values[name] = value
+
+    def reset(self):
+        self.frame_times.clear()
+        self.frame_sections.clear()
+        self.spans.clear()
+
+    # == Statistics ==
+    def section_names(self):
+        # In the order they were first seen
+        names = {}
+        for sections in self.frame_sections:
+            names.update(dict.fromkeys(sections))
+        return list(names)
+
+    def stats(self, name=None):
+        """Mean, p50, p95 and p99 in milliseconds, for whole frames or one section.
+
+        Frames where a section didn't run count as 0 ms for that section.
+        """
+        if name is None:
+            samples = list(self.frame_times)
+        else:
+            samples = [sections.get(name, 0.0) for sections in self.frame_sections]
+        samples.sort()
+        mean = sum(samples) / len(samples) if samples else 0.0
+        return {
+            "mean": mean * 1000,
+            "p50": percentile(samples, 0.50) * 1000,
+            "p95": percentile(samples, 0.95) * 1000,
+            "p99": percentile(samples, 0.99) * 1000,
+        }
+
+    def summary(self):
+        """{"frame": stats, section name: stats, ...}"""
+        result = {"frame": self.stats()}
+        for name in self.section_names():
+            result[name] = self.stats(name)
+        return result
+
+    # == Export ==
+    def chrome_trace(self):
+        events = [
+            {"name": name, "ph": "X", "ts": start * 1e6, "dur": (end - start) * 1e6, "pid": 0, "tid": 0}
+            for name, start, end in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        with open(path, "w") as file:
+            json.dump(self.chrome_trace(), file)
+        return path
+
+class NullProfiler:
+    """Stand-in used when nothing is profiling: every section is a no-op."""
+    enabled = False
+
+    def section(self, name):
+        return NO_SECTION
+
+    def set_value(self, name, value):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+def profiled(method):
+    """Times a method as a section named after it, using self.profiler."""
+    name = method.__name__
+
+    def wrapper(self, *args, **kwargs):
+        with self.profiler.section(name):
+            return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
@@ -0,0 +1,86 @@
+"""
+Profiler Overlay
+
+In-game readout of a FrameProfiler (toggle with F3 in main.py).
+
+- Shows frame time mean / p50 / p95 / p99, the mean time of every section,
+  any extra values the profiler carries (e.g. quality level), and a graph
+  of the last GRAPH_FRAMES frame times against the 60 FPS budget line.
+- The panel is only re-rendered every refresh_interval frames; in between
+  the same surface is blitted again, so the overlay barely shows up in its
+  own numbers. Each refresh makes a new surface so DirtyRectRenderer sees it.
+"""
+
+import pygame
+
+GRAPH_FRAMES = 240
+GRAPH_HEIGHT = 80
+PANEL_WIDTH = 360
+BUDGET_MS = 1000 / 60
+
+class ProfilerOverlay:
+    def __init__(self, profiler, font, position=(10, 10), refresh_interval=15):
+        self.profiler = profiler
+        self.font = font
+        self.position = position
+        self.refresh_interval = refresh_interval
+        self.visible = False
+        self.surface = None
+        self.frames_until_refresh = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.profiler.enabled = self.visible
+        self.surface = None
+        self.frames_until_refresh = 0
+
+    def apply_quality(self, settings):
+        # Re-render less often when frame_pacing.QualityController is short on time
+        self.refresh_interval = settings["overlay_refresh"]
+
+    def draw(self, screen):
+        if not self.visible:
+            return
+        if self.surface is None or self.frames_until_refresh <= 0:
+            self.surface = self.render()
+            self.frames_until_refresh = self.refresh_interval
+        self.frames_until_refresh -= 1
+        screen.blit(self.surface, self.position)
+
+    def render(self):
+        profiler = self.profiler
+        frame = profiler.stats()
+        rows = [("frame p50 / p95 / p99", f"{frame['p50']:.2f} / {frame['p95']:.2f} / {frame['p99']:.2f} ms")]
+        rows += [(name, f"{profiler.stats(name)['mean']:.3f} ms") for name in profiler.section_names()]
+        rows += [(name, str(value)) for name, value in profiler.values.items()]
+
+        line_height = self.font.get_linesize()
+        height = line_height * len(rows) + GRAPH_HEIGHT + 16
+        surface = pygame.Surface((PANEL_WIDTH, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+
+        # Labels on the left, values right-aligned, so the columns line up with any font
+        for index, (label, value) in enumerate(rows):
+            y = 4 + index * line_height
+            surface.blit(self.font.render(label, True, (220, 220, 220)), (6, y))
+            value_surface = self.font.render(value, True, (220, 220, 220))
+            surface.blit(value_surface, (PANEL_WIDTH - 6 - value_surface.get_width(), y))
+
+        self.draw_graph(surface, pygame.Rect(6, height - GRAPH_HEIGHT - 6, PANEL_WIDTH - 12, GRAPH_HEIGHT))
+        return surface
+
+    def draw_graph(self, surface, area):
+        # Frame times scaled so the 60 FPS budget sits halfway up the graph
+        scale = area.height / (2 * BUDGET_MS)
+        budget_y = area.bottom - round(BUDGET_MS * scale)
+        pygame.draw.line(surface, (200, 80, 80), (area.left, budget_y), (area.right, budget_y))
+
+        times = list(self.profiler.frame_times)[-GRAPH_FRAMES:]
+        if len(times) < 2:
+            return
+        step = area.width / (GRAPH_FRAMES - 1)
+        points = [
+            (area.left + round(index * step), area.bottom - min(area.height, round(seconds * 1000 * scale)))
+            for index, seconds in enumerate(times)
+        ]
+        pygame.draw.lines(surface, (120, 220, 120), False, points)
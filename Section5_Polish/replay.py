@@ -0,0 +1,161 @@
+"""
+Replays
+
+Records a match as its seed plus per-tick inputs, and re-simulates it bit-exactly.
+
+- ReplayRecorder wraps a Match: call recorder.step(inputs) instead of match.step.
+- Each tick is stored as one byte (up/down bits + number of key presses),
+  followed by one byte per key pressed that tick, so a 10 minute match at
+  60 ticks/sec is roughly 36 KB before any compression.
+- Matches using the "table" opponent need the same intercept table passed
+  back in (ReplayPlayer(data, intercept_table=...)) to replay exactly.
+- The file ends with a checksum of the final snapshot; ReplayPlayer.verify()
+  re-runs the match and checks it lands on exactly the same state.
+
+File layout (little-endian):
+    header  "PONGRPL3", then the match config: seed (u64), collision (u8),
+            ball w/h, paddle w/h (4 x u16), opponent strategy (u8),
+            reaction delay (u16), aim error (u16), opponent speed (u8),
+            extra balls (u16), win score (u8)
+    ticks   u32 tick count, then the tick bytes
+    footer  u32 CRC32 of the final Match.snapshot()
+"""
+
+import struct
+import zlib
+from engine import Match, Inputs
+
+MAGIC = b"PONGRPL3"
+CONFIG = struct.Struct("<QB4HBHHBHB")
+COUNT = struct.Struct("<I")
+
+KEY_CODES = ("1", "2", "3", "4", "5", "6", "7", "8", "space")
+COLLISION_MODES = ("discrete", "swept")
+OPPONENT_STRATEGIES = ("chase", "predict", "table")
+
+UP_BIT = 0x01
+DOWN_BIT = 0x02
+MAX_PRESSES = 0x3F   # Presses per tick that fit in the remaining 6 bits
+
+def encode_inputs(inputs):
+    presses = inputs.presses[:MAX_PRESSES]
+    flags = (UP_BIT if inputs.up else 0) | (DOWN_BIT if inputs.down else 0) | (len(presses) << 2)
+    return bytes((flags, *(KEY_CODES.index(key) for key in presses)))
+
+def decode_inputs(data, offset):
+    """Decode one tick starting at offset; returns (Inputs, next offset)."""
+    flags = data[offset]
+    count = flags >> 2
+    presses = tuple(KEY_CODES[code] for code in data[offset + 1:offset + 1 + count])
+    return Inputs(bool(flags & UP_BIT), bool(flags & DOWN_BIT), presses), offset + 1 + count
+
+def pack_config(match):
+    """Everything needed to rebuild an identical fresh Match."""
+    opponent = match.opponent
+    return CONFIG.pack(
+        match.seed, COLLISION_MODES.index(match.collision),
+        *match.ball.rect.size, *match.player.rect.size,
+        OPPONENT_STRATEGIES.index(opponent.strategy), opponent.reaction_delay, opponent.aim_error,
+        match.opponent_start_speed, match.extra_balls, match.win_score
+    )
+
+def unpack_config(data, offset):
+    """Match keyword arguments from a packed config."""
+    (seed, collision, ball_w, ball_h, paddle_w, paddle_h,
+     strategy, reaction_delay, aim_error, opponent_speed, extra_balls, win_score) = CONFIG.unpack_from(data, offset)
+    return {
+        "seed": seed,
+        "collision": COLLISION_MODES[collision],
+        "ball_size": (ball_w, ball_h),
+        "paddle_size": (paddle_w, paddle_h),
+        "opponent_strategy": OPPONENT_STRATEGIES[strategy],
+        "reaction_delay": reaction_delay,
+        "aim_error": aim_error,
+        "opponent_speed": opponent_speed,
+        "extra_balls": extra_balls,
+        "win_score": win_score,
+    }
+
+def snapshot_checksum(snapshot):
+    return zlib.crc32(repr(snapshot).encode())
+
+class ReplayRecorder:
+    def __init__(self, match):
+        self.match = match
+        self.start = match.snapshot()
+        self.ticks = bytearray()
+        self.tick_count = 0
+
+        if self.start[0] != 0:
+            raise ValueError("Replays must start recording from a fresh Match")
+        if match.obstacles or match.ball_collisions:
+            raise ValueError("Arena obstacles and ball collisions aren't stored in the replay config")
+
+    def step(self, inputs):
+        self.ticks += encode_inputs(inputs)
+        self.tick_count += 1
+        self.match.step(inputs)
+
+    def to_bytes(self):
+        header = MAGIC + pack_config(self.match)
+        footer = COUNT.pack(snapshot_checksum(self.match.snapshot()))
+        return header + COUNT.pack(self.tick_count) + bytes(self.ticks) + footer
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+class ReplayPlayer:
+    def __init__(self, data, intercept_table=None):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a Pong replay file")
+
+        self.config = unpack_config(data, len(MAGIC))
+        self.config["intercept_table"] = intercept_table
+        self.config_bytes = bytes(data[len(MAGIC):len(MAGIC) + CONFIG.size])
+
+        self.tick_count, = COUNT.unpack_from(data, len(MAGIC) + CONFIG.size)
+        self.data = data
+        self.body_start = len(MAGIC) + CONFIG.size + COUNT.size
+        self.checksum, = COUNT.unpack_from(data, len(data) - COUNT.size)
+
+        self.rewind()
+
+    @classmethod
+    def load(cls, path, intercept_table=None):
+        with open(path, "rb") as file:
+            return cls(file.read(), intercept_table)
+
+    def __len__(self):
+        return self.tick_count
+
+    def rewind(self):
+        self.match = Match(**self.config)
+        self.offset = self.body_start
+        self.tick = 0
+
+    def __iter__(self):
+        # Yields the Inputs of each remaining tick without stepping the match
+        offset = self.offset
+        for _ in range(self.tick, self.tick_count):
+            inputs, offset = decode_inputs(self.data, offset)
+            yield inputs
+
+    def step(self):
+        """Apply the next recorded tick; returns False once the replay is over."""
+        if self.tick >= self.tick_count:
+            return False
+        inputs, self.offset = decode_inputs(self.data, self.offset)
+        self.match.step(inputs)
+        self.tick += 1
+        return True
+
+    def run(self):
+        while self.step():
+            pass
+        return self.match
+
+    def verify(self):
+        """Re-simulate from the start and check the final state matches the recording."""
+        self.rewind()
+        return snapshot_checksum(self.run().snapshot()) == self.checksum
@@ -0,0 +1,187 @@
+"""
+Replay Archive
+
+Columnar replay files that are read through a memory map, for scrubbing.
+
+- Built from a recorded replay (replay.py): the match is simulated once and
+  the state after every tick is written out column by column (all ball x's,
+  then all ball y's, ...), each column a fixed-size NumPy dtype.
+- ReplayArchive opens the file with numpy.memmap, so columns are zero-copy
+  views; opening a 10 minute replay doesn't read it into memory.
+- Every KEYFRAME_INTERVAL frames a full Match.snapshot() is stored. seek()
+  restores the nearest keyframe and re-simulates at most that many ticks
+  from the embedded inputs, giving the exact state at any frame.
+- ReplayViewer points a Game at an archive so Game.draw can show any frame.
+
+Frame n is the state after n ticks (frame 0 is the fresh match).
+"""
+
+import struct
+import numpy as np
+from engine import Match
+from replay import ReplayPlayer, decode_inputs, unpack_config, CONFIG
+
+MAGIC = b"PONGARC2"
+HEADER = struct.Struct(f"<8s{CONFIG.size}s4I")   # magic, match config, frames, interval, keyframes, inputs size
+KEYFRAME_INTERVAL = 120
+
+COLUMNS = (
+    ("ball_x", "<i2"),
+    ("ball_y", "<i2"),
+    ("ball_x_speed", "<i1"),
+    ("ball_y_speed", "<i1"),
+    ("ball_active", "<u1"),
+    ("player_y", "<i2"),
+    ("opponent_y", "<i2"),
+    ("player_score", "<u1"),
+    ("opponent_score", "<u1"),
+    ("game_state", "<u1"),      # Index into Match.GAME_STATES
+    ("input_offset", "<u4"),    # Where this frame's next tick starts in the input bytes
+)
+
+# Same order as Match.snapshot()
+KEYFRAME_DTYPE = np.dtype([
+    ("tick", "<u4"), ("game_state", "<u1"), ("rng_state", "<u8"),
+    ("ball_x", "<i4"), ("ball_y", "<i4"), ("ball_x_speed", "<i4"), ("ball_y_speed", "<i4"), ("ball_active", "<u1"),
+    ("player_y", "<i4"), ("player_speed", "<i4"),
+    ("opponent_y", "<i4"), ("opponent_speed", "<i4"),
+    ("player_score", "<i4"), ("opponent_score", "<i4"),
+    ("opponent_replan", "<u1"), ("opponent_target_y", "<i4"), ("opponent_pending_target_y", "<i4"),
+    ("opponent_countdown", "<i4"), ("opponent_rng_state", "<u8"),
+])
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+def _layout(frame_count, keyframe_count, inputs_size):
+    """Byte offset of every column, the keyframes and the input bytes."""
+    offsets = {}
+    offset = _align(HEADER.size)
+    for name, dtype in COLUMNS:
+        offsets[name] = offset
+        offset = _align(offset + np.dtype(dtype).itemsize * frame_count)
+    offsets["keyframes"] = offset
+    offset = _align(offset + KEYFRAME_DTYPE.itemsize * keyframe_count)
+    offsets["inputs"] = offset
+    return offsets, offset + inputs_size
+
+def write_archive(replay, path, keyframe_interval=KEYFRAME_INTERVAL):
+    """Simulate a ReplayPlayer from the start and write it as an archive file."""
+    replay.rewind()
+    match = replay.match
+    if match.ball_pool:
+        raise ValueError("Multi-ball replays can't be archived: keyframes have a fixed layout")
+    frame_count = len(replay) + 1
+    keyframe_count = (frame_count - 1) // keyframe_interval + 1
+
+    columns = {name: np.zeros(frame_count, dtype) for name, dtype in COLUMNS}
+    keyframes = np.zeros(keyframe_count, KEYFRAME_DTYPE)
+
+    for frame in range(frame_count):
+        snapshot = match.snapshot()
+        if frame % keyframe_interval == 0:
+            keyframes[frame // keyframe_interval] = snapshot
+
+        columns["ball_x"][frame] = match.ball.rect.x
+        columns["ball_y"][frame] = match.ball.rect.y
+        columns["ball_x_speed"][frame] = match.ball.x_speed
+        columns["ball_y_speed"][frame] = match.ball.y_speed
+        columns["ball_active"][frame] = match.ball.active
+        columns["player_y"][frame] = match.player.rect.y
+        columns["opponent_y"][frame] = match.opponent.rect.y
+        columns["player_score"][frame] = match.player_score
+        columns["opponent_score"][frame] = match.opponent_score
+        columns["game_state"][frame] = snapshot[1]
+        columns["input_offset"][frame] = replay.offset - replay.body_start
+
+        replay.step()
+
+    inputs = replay.data[replay.body_start:replay.offset]
+    offsets, total_size = _layout(frame_count, keyframe_count, len(inputs))
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(
+            MAGIC, replay.config_bytes,
+            frame_count, keyframe_interval, keyframe_count, len(inputs)
+        ))
+        for name, _ in COLUMNS:
+            file.seek(offsets[name])
+            file.write(columns[name].tobytes())
+        file.seek(offsets["keyframes"])
+        file.write(keyframes.tobytes())
+        file.seek(offsets["inputs"])
+        file.write(inputs)
+        file.truncate(total_size)
+
+class ReplayArchive:
+    def __init__(self, path, intercept_table=None):
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+
+        (magic, config, self.frame_count, self.keyframe_interval,
+         keyframe_count, inputs_size) = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a Pong replay archive")
+
+        self.config = unpack_config(config, 0)
+        self.config["intercept_table"] = intercept_table
+
+        # == Zero-copy Views ==
+        offsets, _ = _layout(self.frame_count, keyframe_count, inputs_size)
+        self.columns = {
+            name: np.frombuffer(self.data, dtype, self.frame_count, offsets[name])
+            for name, dtype in COLUMNS
+        }
+        self.keyframes = np.frombuffer(self.data, KEYFRAME_DTYPE, keyframe_count, offsets["keyframes"])
+        self.inputs = memoryview(self.data)[offsets["inputs"]:offsets["inputs"] + inputs_size]
+
+    def __len__(self):
+        return self.frame_count
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def new_match(self):
+        return Match(**self.config)
+
+    def seek(self, match, frame):
+        """Put match into the exact state of the given frame."""
+        if not 0 <= frame < self.frame_count:
+            raise IndexError(f"frame {frame} out of range")
+
+        keyframe = frame // self.keyframe_interval
+        match.restore(tuple(int(value) for value in self.keyframes[keyframe].item()))
+
+        # Re-simulate from the keyframe without triggering sounds or other observers
+        observers, match.observers = match.observers, []
+        offset = int(self.columns["input_offset"][keyframe * self.keyframe_interval])
+        for _ in range(frame - keyframe * self.keyframe_interval):
+            inputs, offset = decode_inputs(self.inputs, offset)
+            match.step(inputs)
+        match.observers = observers
+        return match
+
+class ReplayViewer:
+    """Read-only playback of an archive through an existing Game's draw methods."""
+    def __init__(self, game, archive):
+        self.game = game
+        self.archive = archive
+        # The Game draws a Match built from the recorded config, so every setting matches
+        config = dict(archive.config)
+        config["intercept_table"] = config["intercept_table"] or game.match.opponent.intercept_table
+        self.game.use_match(Match(**config))
+        self.frame = 0
+        self.seek(0)
+
+    def seek(self, frame):
+        self.frame = max(0, min(frame, len(self.archive) - 1))
+        self.archive.seek(self.game.match, self.frame)
+
+    def advance(self, frames=1):
+        self.seek(self.frame + frames)
+
+    def draw(self, screen, alpha=1.0):
+        self.game.draw(screen, alpha)
+
+def archive_replay_file(replay_path, archive_path, keyframe_interval=KEYFRAME_INTERVAL):
+    write_archive(ReplayPlayer.load(replay_path), archive_path, keyframe_interval)
+    return ReplayArchive(archive_path)
@@ -0,0 +1,307 @@
+"""
+Match Server
+
+Asyncio server hosting many authoritative Pong matches in one process.
+
+- Every room owns a headless Match (engine.py); no display or audio is touched.
+- One scheduler task ticks every room at TICK_RATE, so hundreds of rooms
+  share a single event loop instead of running a task (or thread) each.
+- Clients connect over TCP, JOIN a room by name and send their inputs; the
+  first player gets the left paddle, the second the right one (the engine's
+  "remote" opponent). A room joined with vs_cpu plays against the CPU instead.
+- After every tick each client gets the room's state from its own
+  snapshot_codec.SnapshotEncoder: bit-packed deltas against the last
+  snapshot that client acknowledged (a few bytes a tick). Spectators get
+  the same stream but can't send input; spectator.py draws it.
+- Each room records how long its ticks take (rolling p50 / p99).
+- When the loop falls behind it degrades instead of spiralling: it
+  broadcasts state less often first, and if it's still more than
+  MAX_CATCH_UP ticks behind it drops the backlog (the matches run slower
+  rather than the server locking up). Clients whose socket buffers fill up
+  are skipped until they catch up; their deltas just grow (or become
+  keyframes) until they ack again.
+
+Message framing (little-endian): payload length (u16), type (u8), payload.
+A malformed message gets the client disconnected; the server carries on.
+    JOIN     client -> server   vs_cpu (u8), room name (utf-8)
+    INPUT    client -> server   one tick of input encoded as in replay.py
+    WELCOME  server -> client   side (u8: 0 left, 1 right, 2 spectator),
+                                position step (u8), velocity step (u8) for the decoder
+    FULL     server -> client   the room already has two players
+    STATE    server -> client   one snapshot from snapshot_codec.py
+    ACK      client -> server   sequence (u8) of the newest snapshot decoded
+    SPECTATE client -> server   room name (utf-8)
+    NO_ROOM  server -> client   there's no room with that name to spectate
+
+Run:  python server.py --port 7777
+Load test with bot_client.py.
+"""
+
+import argparse
+import asyncio
+import struct
+import time
+from collections import deque
+from engine import Match, Inputs, NO_INPUT
+from replay import decode_inputs
+from profiler import percentile
+from snapshot_codec import SnapshotEncoder, BandwidthStats, match_state
+
+TICK_RATE = 60
+MAX_CATCH_UP = 5              # Ticks behind before the backlog is dropped
+MAX_BROADCAST_INTERVAL = 4    # Worst case: state goes out every 4th tick
+MAX_CLIENT_BUFFER = 64 * 1024 # Bytes queued for a client before we stop sending it state
+LATENCY_HISTORY = 600
+MAX_QUEUED_PRESSES = 8
+
+HEADER = struct.Struct("<HB")
+JOIN, INPUT, WELCOME, FULL, STATE, ACK, SPECTATE, NO_ROOM = range(1, 9)
+SPECTATOR = 2
+MIN_PAYLOAD = {JOIN: 1, INPUT: 1, ACK: 1}   # Shorter messages are malformed
+
+def frame(message_type, payload=b""):
+    return HEADER.pack(len(payload), message_type) + payload
+
+async def read_message(reader):
+    length, message_type = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return message_type, await reader.readexactly(length)
+
+class Client:
+    def __init__(self, writer, encoder):
+        self.writer = writer
+        self.encoder = encoder        # Deltas against what this client has acked
+        self.room = None
+        self.side = None
+        self.inputs = NO_INPUT        # Held direction, kept until the next INPUT
+        self.presses = []             # Key presses waiting for the next tick
+
+    def send(self, message_type, payload=b""):
+        self.writer.write(frame(message_type, payload))
+
+    def backed_up(self):
+        return self.writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER
+
+    def take_inputs(self):
+        inputs = Inputs(self.inputs.up, self.inputs.down, tuple(self.presses))
+        self.presses.clear()
+        return inputs
+
+class Room:
+    def __init__(self, name, vs_cpu, seed=None):
+        self.name = name
+        self.vs_cpu = vs_cpu
+        self.match = Match(seed=seed, opponent_strategy="predict" if vs_cpu else "remote",
+                           reaction_delay=6, aim_error=40)
+        self.clients = [None, None]   # Left, right
+        self.sides = (0,) if vs_cpu else (0, 1)
+        self.spectators = []
+        self.tick_times = deque(maxlen=LATENCY_HISTORY)
+        self.started = False
+
+    @property
+    def full(self):
+        return all(self.clients[side] is not None for side in self.sides)
+
+    def join(self, client):
+        for side in self.sides:
+            if self.clients[side] is None:
+                self.clients[side] = client
+                client.room, client.side = self, side
+                return side
+        return None
+
+    def spectate(self, client):
+        self.spectators.append(client)
+        client.room, client.side = self, SPECTATOR
+
+    def leave(self, client):
+        if client.side == SPECTATOR:
+            self.spectators.remove(client)
+        else:
+            self.clients[client.side] = None
+
+    @property
+    def empty(self):
+        return self.clients == [None, None] and not self.spectators
+
+    def step(self):
+        start = time.perf_counter()
+        left, right = self.clients
+        if self.full and not self.started:
+            self.match.step(Inputs(presses=("2", "space")))
+            self.started = True
+        elif self.started:
+            self.match.step(
+                left.take_inputs() if left else NO_INPUT,
+                right.take_inputs() if right else NO_INPUT
+            )
+        self.tick_times.append(time.perf_counter() - start)
+
+    def broadcast(self):
+        state = match_state(self.match)
+        for client in (*self.clients, *self.spectators):
+            if client is None or client.backed_up():
+                continue
+            client.send(STATE, client.encoder.encode(state))
+
+    def latency_ms(self):
+        times = sorted(self.tick_times)
+        return percentile(times, 0.50) * 1000, percentile(times, 0.99) * 1000
+
+class MatchServer:
+    def __init__(self, tick_rate=TICK_RATE, position_step=1, velocity_step=1):
+        self.tick_rate = tick_rate
+        self.rooms = {}
+        self.tick = 0
+
+        # == Snapshots ==
+        self.position_step = position_step
+        self.velocity_step = velocity_step
+        self.bandwidth = BandwidthStats()   # Every snapshot sent since the last report
+
+        # == Load Shedding ==
+        self.broadcast_interval = 1
+        self.dropped_ticks = 0
+        self.late_ticks = 0
+        self.on_time_ticks = 0
+
+    # == Connections ==
+    async def handle_client(self, reader, writer):
+        client = Client(writer, SnapshotEncoder(self.position_step, self.velocity_step, self.bandwidth))
+        try:
+            while True:
+                message_type, payload = await read_message(reader)
+                if len(payload) < MIN_PAYLOAD.get(message_type, 0):
+                    raise ValueError(f"message type {message_type} needs {MIN_PAYLOAD[message_type]} payload bytes")
+                if message_type == ACK:
+                    client.encoder.ack(payload[0])
+                elif message_type == JOIN and client.room is None:
+                    self.join(client, payload[1:].decode(), bool(payload[0]))
+                elif message_type == SPECTATE and client.room is None:
+                    self.spectate(client, payload.decode())
+                elif message_type == INPUT and client.room is not None and client.side != SPECTATOR:
+                    inputs, _ = decode_inputs(payload, 0)
+                    client.inputs = inputs
+                    client.presses.extend(inputs.presses[:MAX_QUEUED_PRESSES - len(client.presses)])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (ValueError, IndexError, UnicodeDecodeError) as error:
+            # Malformed message (short payload, bad room name, unknown key code): drop the client
+            print(f"Dropping client: {error!r}")
+        finally:
+            if client.room is not None:
+                self.leave(client)
+            writer.close()
+
+    def join(self, client, name, vs_cpu):
+        room = self.rooms.get(name)
+        if room is None:
+            room = self.rooms[name] = Room(name, vs_cpu)
+        side = room.join(client)
+        if side is None:
+            client.send(FULL)
+        else:
+            self.welcome(client, side)
+
+    def spectate(self, client, name):
+        room = self.rooms.get(name)
+        if room is None:
+            client.send(NO_ROOM)
+        else:
+            room.spectate(client)
+            self.welcome(client, SPECTATOR)
+
+    def welcome(self, client, side):
+        client.send(WELCOME, bytes((side, self.position_step, self.velocity_step)))
+
+    def leave(self, client):
+        room = client.room
+        room.leave(client)
+        if room.empty:
+            del self.rooms[room.name]
+
+    # == Scheduler ==
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        tick_time = 1 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            behind = (loop.time() - next_tick) / tick_time
+            if behind > MAX_CATCH_UP:
+                # Too far behind to catch up: let the matches slow down instead
+                skipped = int(behind) - 1
+                self.dropped_ticks += skipped
+                next_tick += skipped * tick_time
+            self.adjust_broadcast_interval(behind)
+
+            while next_tick <= loop.time():
+                self.tick_rooms()
+                next_tick += tick_time
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def adjust_broadcast_interval(self, behind):
+        # Halve the state rate while late; restore it after a second of on-time ticks
+        if behind > 1:
+            self.late_ticks += 1
+            self.on_time_ticks = 0
+            self.broadcast_interval = min(MAX_BROADCAST_INTERVAL, self.broadcast_interval * 2)
+        else:
+            self.on_time_ticks += 1
+            if self.on_time_ticks >= self.tick_rate and self.broadcast_interval > 1:
+                self.broadcast_interval //= 2
+                self.on_time_ticks = 0
+
+    def tick_rooms(self):
+        broadcast = self.tick % self.broadcast_interval == 0
+        for room in list(self.rooms.values()):
+            room.step()
+            if broadcast:
+                room.broadcast()
+        self.tick += 1
+
+    # == Stats ==
+    def stats(self):
+        latencies = [room.latency_ms() for room in self.rooms.values()]
+        return {
+            "rooms": len(self.rooms),
+            "clients": sum(client is not None for room in self.rooms.values() for client in room.clients),
+            "spectators": sum(len(room.spectators) for room in self.rooms.values()),
+            "tick": self.tick,
+            "room_tick_p50_ms": max((p50 for p50, _ in latencies), default=0.0),
+            "room_tick_p99_ms": max((p99 for _, p99 in latencies), default=0.0),
+            "broadcast_interval": self.broadcast_interval,
+            "dropped_ticks": self.dropped_ticks,
+        }
+
+    async def report(self, interval=5.0):
+        while True:
+            await asyncio.sleep(interval)
+            stats = self.stats()
+            print(f"{stats['rooms']} rooms, {stats['clients']} clients, {stats['spectators']} spectators, tick {stats['tick']}, "
+                  f"worst room tick p50 {stats['room_tick_p50_ms']:.3f} ms / p99 {stats['room_tick_p99_ms']:.3f} ms, "
+                  f"broadcast every {stats['broadcast_interval']} tick(s), {stats['dropped_ticks']} dropped ticks")
+            print(f"  {self.bandwidth.summary(self.tick_rate)}")
+            self.bandwidth.reset()
+
+async def serve(host, port, report_interval=5.0, position_step=1, velocity_step=1):
+    server = MatchServer(position_step=position_step, velocity_step=velocity_step)
+    listener = await asyncio.start_server(server.handle_client, host, port)
+    print(f"Pong match server on {host}:{port}")
+    async with listener:
+        await asyncio.gather(listener.serve_forever(), server.run(), server.report(report_interval))
+
+def main():
+    parser = argparse.ArgumentParser(description="Pong match server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--report", type=float, default=5.0, help="Seconds between stats lines")
+    parser.add_argument("--position-step", type=int, default=1, help="Quantize positions to this many pixels")
+    parser.add_argument("--velocity-step", type=int, default=1, help="Quantize velocities to this many pixels per tick")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.report, args.position_step, args.velocity_step))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Snapshot Codec
+
+Bit-packed, delta-compressed match state for spectators and server clients.
+
+- A snapshot is the handful of ints needed to draw a match (STATE_FIELDS):
+  ball position / velocity / active, both paddle y's, scores and game_state.
+- Each snapshot is encoded against the newest one the receiver has
+  acknowledged (the baseline). With no usable baseline (nothing acked yet,
+  or the ack is more than MAX_BASELINE_AGE snapshots old) it's a keyframe,
+  encoded against all zeros.
+- Every field gets a "changed" bit; changed fields carry a zigzag-encoded
+  difference in the smallest of four sizes (DELTA_BITS) that fits. Fields
+  that rarely change (velocity, scores, game_state) sit behind one shared
+  bit, so a quiet tick spends a single bit on all six.
+- The ball's position is predicted from the baseline's velocity before
+  taking the difference, so a ball flying straight costs nothing; only
+  bounces, serves and points cost bits.
+- position_step / velocity_step quantize those fields (e.g. 2 = to the
+  nearest 2 pixels) for smaller deltas at the cost of precision. The
+  decoder must use the same steps.
+- A snapshot starts with an 8-bit sequence number and a 5-bit baseline age.
+  Typical play with the baseline a few ticks behind takes 3-6 bytes.
+- BandwidthStats keeps count of snapshots, bytes and keyframes.
+
+The decoder's output can be put on a Match with apply_state(), which is
+how spectator.py feeds a read-only Game.draw.
+"""
+
+from engine import Match
+
+STATE_FIELDS = (
+    "ball_x", "ball_y", "ball_x_speed", "ball_y_speed", "ball_active",
+    "player_y", "opponent_y", "player_score", "opponent_score", "game_state",
+)
+BALL_X, BALL_Y, BALL_X_SPEED, BALL_Y_SPEED, BALL_ACTIVE, PLAYER_Y, OPPONENT_Y, \
+    PLAYER_SCORE, OPPONENT_SCORE, GAME_STATE = range(len(STATE_FIELDS))
+HOT_FIELDS = (BALL_X, BALL_Y, PLAYER_Y, OPPONENT_Y)   # Change nearly every tick
+COLD_FIELDS = (BALL_X_SPEED, BALL_Y_SPEED, BALL_ACTIVE, PLAYER_SCORE, OPPONENT_SCORE, GAME_STATE)
+POSITION_FIELDS = (BALL_X, BALL_Y, PLAYER_Y, OPPONENT_Y)
+VELOCITY_FIELDS = (BALL_X_SPEED, BALL_Y_SPEED)
+PLAYING = Match.GAME_STATES.index("game")
+ZERO_STATE = (0,) * len(STATE_FIELDS)
+
+SEQUENCE_BITS = 8
+AGE_BITS = 5
+MAX_BASELINE_AGE = (1 << AGE_BITS) - 1   # Age 0 means keyframe
+DELTA_BITS = (3, 6, 9, 16)               # Picked with a 2-bit size class
+
+def match_state(match):
+    """The fields a viewer needs to draw the match, as a tuple of ints."""
+    ball = match.ball
+    return (
+        ball.rect.x, ball.rect.y, ball.x_speed, ball.y_speed, int(ball.active),
+        match.player.rect.y, match.opponent.rect.y,
+        match.player_score, match.opponent_score, Match.GAME_STATES.index(match.game_state),
+    )
+
+def apply_state(match, state):
+    """Put a decoded state on a Match so a Game can draw it (nothing is simulated)."""
+    ball, player, opponent = match.ball, match.player, match.opponent
+    for body in (ball, player, opponent):
+        body.store_previous()
+    (ball.rect.x, ball.rect.y, ball.x_speed, ball.y_speed, active,
+     player.rect.y, opponent.rect.y,
+     match.player_score, match.opponent_score, game_state) = state
+    ball.active = bool(active)
+    match.game_state = Match.GAME_STATES[game_state]
+    if not ball.active:
+        ball.store_previous()   # Reset to the centre: don't interpolate across the screen
+
+# == Bit Packing ==
+class BitWriter:
+    def __init__(self):
+        self.value = 0
+        self.length = 0
+
+    def write(self, value, bits):
+        self.value |= (value & ((1 << bits) - 1)) << self.length
+        self.length += bits
+
+    def to_bytes(self):
+        return self.value.to_bytes((self.length + 7) // 8, "little")
+
+class BitReader:
+    def __init__(self, data):
+        self.value = int.from_bytes(data, "little")
+        self.position = 0
+
+    def read(self, bits):
+        value = (self.value >> self.position) & ((1 << bits) - 1)
+        self.position += bits
+        return value
+
+def zigzag(value):
+    # 0, -1, 1, -2, 2 ... -> 0, 1, 2, 3, 4 ..., so small differences use few bits either way
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+def write_delta(writer, delta):
+    writer.write(delta != 0, 1)
+    if delta == 0:
+        return
+    value = zigzag(delta)
+    for size_class, bits in enumerate(DELTA_BITS):
+        if value < 1 << bits:
+            writer.write(size_class, 2)
+            writer.write(value, bits)
+            return
+    raise ValueError(f"Snapshot delta {delta} doesn't fit in {DELTA_BITS[-1]} bits")
+
+def read_delta(reader):
+    if not reader.read(1):
+        return 0
+    return unzigzag(reader.read(DELTA_BITS[reader.read(2)]))
+
+# == Quantization ==
+def quantize(value, step):
+    return (value + step // 2) // step
+
+class Quantizer:
+    def __init__(self, position_step=1, velocity_step=1):
+        self.steps = [1] * len(STATE_FIELDS)
+        for index in POSITION_FIELDS:
+            self.steps[index] = position_step
+        for index in VELOCITY_FIELDS:
+            self.steps[index] = velocity_step
+
+    def quantize(self, state):
+        return tuple(quantize(value, step) for value, step in zip(state, self.steps))
+
+    def dequantize(self, state):
+        return tuple(value * step for value, step in zip(state, self.steps))
+
+    def predict(self, baseline, age):
+        """The baseline (quantized) with the ball moved on age ticks at its velocity."""
+        if age == 0 or not baseline[BALL_ACTIVE] or baseline[GAME_STATE] != PLAYING:
+            return baseline
+        steps = self.steps
+        predicted = list(baseline)
+        for position, velocity in ((BALL_X, BALL_X_SPEED), (BALL_Y, BALL_Y_SPEED)):
+            moved = baseline[position] * steps[position] + baseline[velocity] * steps[velocity] * age
+            predicted[position] = quantize(moved, steps[position])
+        return predicted
+
+def write_fields(writer, state, predicted):
+    for index in HOT_FIELDS:
+        write_delta(writer, state[index] - predicted[index])
+    cold_changed = any(state[index] != predicted[index] for index in COLD_FIELDS)
+    writer.write(cold_changed, 1)
+    if cold_changed:
+        for index in COLD_FIELDS:
+            write_delta(writer, state[index] - predicted[index])
+
+def read_fields(reader, predicted):
+    state = list(predicted)
+    for index in HOT_FIELDS:
+        state[index] += read_delta(reader)
+    if reader.read(1):
+        for index in COLD_FIELDS:
+            state[index] += read_delta(reader)
+    return tuple(state)
+
+# == Encoder / Decoder ==
+class SnapshotEncoder:
+    """One per receiver: baselines depend on what that receiver has acknowledged."""
+    def __init__(self, position_step=1, velocity_step=1, stats=None):
+        self.quantizer = Quantizer(position_step, velocity_step)
+        self.stats = stats
+        self.sequence = -1
+        self.history = {}   # Sequence -> quantized state, for snapshots not yet superseded by an ack
+        self.acked = None   # Newest acknowledged sequence
+
+    def encode(self, state):
+        self.sequence += 1
+        sequence = self.sequence
+        quantized = self.quantizer.quantize(state)
+
+        age = 0 if self.acked is None else sequence - self.acked
+        if age > MAX_BASELINE_AGE:
+            age = 0
+        baseline = self.history[self.acked] if age else ZERO_STATE
+
+        writer = BitWriter()
+        writer.write(sequence, SEQUENCE_BITS)
+        writer.write(age, AGE_BITS)
+        write_fields(writer, quantized, self.quantizer.predict(baseline, age))
+
+        self.history[sequence] = quantized
+        self.history.pop(sequence - MAX_BASELINE_AGE - 1, None)
+        data = writer.to_bytes()
+        if self.stats is not None:
+            self.stats.record(len(data), age == 0)
+        return data
+
+    def ack(self, sequence):
+        """The receiver decoded the snapshot with this (8-bit) sequence number."""
+        wrap = 1 << SEQUENCE_BITS
+        full = self.sequence - (self.sequence - sequence) % wrap
+        if full in self.history and (self.acked is None or full > self.acked):
+            self.acked = full
+            for old in [old for old in self.history if old < full]:
+                del self.history[old]
+
+class SnapshotDecoder:
+    def __init__(self, position_step=1, velocity_step=1):
+        self.quantizer = Quantizer(position_step, velocity_step)
+        self.history = {}   # 8-bit sequence -> quantized state
+        self.sequence = None
+        self.keyframe = False
+        self.state = None   # Newest decoded state, dequantized
+
+    def decode(self, data):
+        reader = BitReader(data)
+        sequence = reader.read(SEQUENCE_BITS)
+        age = reader.read(AGE_BITS)
+        if age:
+            baseline = self.history.get((sequence - age) % (1 << SEQUENCE_BITS))
+            if baseline is None:
+                raise ValueError(f"Snapshot {sequence} needs baseline {sequence - age}, which was never decoded")
+        else:
+            baseline = ZERO_STATE
+
+        quantized = read_fields(reader, self.quantizer.predict(baseline, age))
+        self.history[sequence] = quantized
+        self.history.pop((sequence - MAX_BASELINE_AGE - 1) % (1 << SEQUENCE_BITS), None)
+        self.sequence = sequence
+        self.keyframe = age == 0
+        self.state = self.quantizer.dequantize(quantized)
+        return self.state
+
+# == Bandwidth ==
+class BandwidthStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.snapshots = 0
+        self.bytes = 0
+        self.keyframes = 0
+        self.largest = 0
+
+    def record(self, size, keyframe=False):
+        self.snapshots += 1
+        self.bytes += size
+        self.keyframes += keyframe
+        self.largest = max(self.largest, size)
+
+    @property
+    def mean_bytes(self):
+        return self.bytes / self.snapshots if self.snapshots else 0.0
+
+    def summary(self, tick_rate=60):
+        return (f"{self.snapshots} snapshots, {self.mean_bytes:.2f} bytes mean ({self.largest} max), "
+                f"{self.keyframes} keyframes, {self.mean_bytes * tick_rate:.0f} B/s per viewer at {tick_rate} Hz")
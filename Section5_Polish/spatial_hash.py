@@ -0,0 +1,114 @@
+"""
+Spatial Hash Class
+
+Uniform grid over the 1280x720 field for finding nearby rects quickly.
+
+- Each rect is stored in every grid cell it overlaps.
+- update() only moves an entry between cells when its cell range changes,
+  which for a ball moving a few pixels a tick is most of the time never.
+- query() and pairs() only look at entries sharing a cell, so finding all
+  ball–ball / ball–obstacle contacts is roughly linear in the number of
+  objects instead of checking every pair.
+- Rects are plain (x, y, width, height) tuples; ids are ints (they're
+  compared to report each pair once in a fixed order).
+
+See benchmarks/bench_spatial_hash.py for a comparison against brute force.
+"""
+
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}     # (column, row) -> list of ids
+        self.rects = {}     # id -> (x, y, width, height)
+        self.ranges = {}    # id -> (first column, first row, last column, last row)
+
+    def cell_range(self, rect):
+        x, y, width, height = rect
+        size = self.cell_size
+        return (x // size, y // size, (x + width - 1) // size, (y + height - 1) // size)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    # == Insert / Update / Remove ==
+    def insert(self, key, rect):
+        cell_range = self.cell_range(rect)
+        self.rects[key] = rect
+        self.ranges[key] = cell_range
+        self._add_to_cells(key, cell_range)
+
+    def update(self, key, rect):
+        cell_range = self.cell_range(rect)
+        self.rects[key] = rect
+        if cell_range != self.ranges[key]:
+            self._remove_from_cells(key, self.ranges[key])
+            self.ranges[key] = cell_range
+            self._add_to_cells(key, cell_range)
+
+    def remove(self, key):
+        self._remove_from_cells(key, self.ranges.pop(key))
+        del self.rects[key]
+
+    def clear(self):
+        self.cells.clear()
+        self.rects.clear()
+        self.ranges.clear()
+
+    def _add_to_cells(self, key, cell_range):
+        first_column, first_row, last_column, last_row = cell_range
+        cells = self.cells
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cell = cells.get((column, row))
+                if cell is None:
+                    cells[(column, row)] = [key]
+                else:
+                    cell.append(key)
+
+    def _remove_from_cells(self, key, cell_range):
+        first_column, first_row, last_column, last_row = cell_range
+        cells = self.cells
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cell = cells[(column, row)]
+                cell.remove(key)
+                if not cell:
+                    del cells[(column, row)]
+
+    # == Queries ==
+    def query(self, rect):
+        """Ids of every stored rect overlapping rect (strict overlap, like colliderect)."""
+        found = set()
+        first_column, first_row, last_column, last_row = self.cell_range(rect)
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                for key in self.cells.get((column, row), ()):
+                    if key not in found and overlaps(rect, self.rects[key]):
+                        found.add(key)
+        return found
+
+    def pairs(self):
+        """Every pair of overlapping stored rects, each reported once."""
+        found = set()
+        rects = self.rects
+        for cell in self.cells.values():
+            count = len(cell)
+            if count < 2:
+                continue
+            for first in range(count - 1):
+                a = cell[first]
+                rect_a = rects[a]
+                for second in range(first + 1, count):
+                    b = cell[second]
+                    pair = (a, b) if a < b else (b, a)
+                    if pair not in found and overlaps(rect_a, rects[b]):
+                        found.add(pair)
+        return found
+
+def overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
@@ -0,0 +1,154 @@
+"""
+Spectator
+
+Read-only viewer: draws a match from snapshot_codec.py snapshots with Game.draw.
+
+- The viewer's Game never simulates anything. Each decoded snapshot is
+  put on its Match with apply_state() and drawn, interpolating between
+  the last two snapshots like the normal fixed-timestep loop does.
+- RemoteFeed spectates a room on server.py over TCP (and acks every
+  snapshot so the server's deltas stay small).
+- LocalFeed runs a CPU vs CPU match in-process through the same encoder and
+  decoder, which shows what a spectator stream costs without a server.
+- The top left corner shows the bandwidth used so far (BandwidthStats).
+
+Run:  python spectator.py --room bot-0 --port 7777
+      python spectator.py --local --position-step 2
+"""
+
+import argparse
+import socket
+import time
+import pygame
+from engine import Match, Inputs, NO_INPUT
+from game import Game
+from snapshot_codec import SnapshotEncoder, SnapshotDecoder, BandwidthStats, match_state, apply_state
+from server import HEADER, WELCOME, STATE, ACK, SPECTATE, NO_ROOM, frame
+from tournament import BotPlayerBody
+
+TICK_RATE = 60
+STATS_REFRESH = 1.0   # Seconds between re-rendering the bandwidth line
+
+class RemoteFeed:
+    def __init__(self, address, room):
+        self.socket = socket.create_connection(address)
+        self.socket.sendall(frame(SPECTATE, room.encode()))
+        self.socket.setblocking(False)
+        self.buffer = bytearray()
+        self.decoder = None
+        self.stats = BandwidthStats()
+
+    def poll(self):
+        """Every snapshot that arrived since the last call, decoded."""
+        while True:
+            try:
+                data = self.socket.recv(65536)
+            except BlockingIOError:
+                break
+            if not data:
+                raise ConnectionError("Server closed the connection")
+            self.buffer += data
+
+        states = []
+        while len(self.buffer) >= HEADER.size:
+            length, message_type = HEADER.unpack_from(self.buffer)
+            if len(self.buffer) < HEADER.size + length:
+                break
+            payload = bytes(self.buffer[HEADER.size:HEADER.size + length])
+            del self.buffer[:HEADER.size + length]
+
+            if message_type == NO_ROOM:
+                raise ConnectionError("No room with that name is running")
+            elif message_type == WELCOME:
+                self.decoder = SnapshotDecoder(payload[1], payload[2])
+            elif message_type == STATE and self.decoder:
+                states.append(self.decoder.decode(payload))
+                self.stats.record(len(payload), self.decoder.keyframe)
+                self.socket.sendall(frame(ACK, bytes((self.decoder.sequence,))))
+        return states
+
+    def close(self):
+        self.socket.close()
+
+class LocalFeed:
+    def __init__(self, seed=None, position_step=1, velocity_step=1):
+        cpu = {"strategy": "predict", "speed": 10, "reaction_delay": 6, "aim_error": 40}
+        self.match = Match(seed=seed, opponent_strategy="predict", reaction_delay=6, aim_error=40)
+        self.match.player = BotPlayerBody(self.match, cpu, self.match.seed ^ 1)
+        self.stats = BandwidthStats()
+        self.encoder = SnapshotEncoder(position_step, velocity_step, self.stats)
+        self.decoder = SnapshotDecoder(position_step, velocity_step)
+
+    def poll(self):
+        # One tick per call; the viewer calls it at TICK_RATE
+        match = self.match
+        if match.game_state != "game":
+            match.step(Inputs(presses=("2",)))
+        match.step(NO_INPUT if match.ball.active else Inputs(presses=("space",)))
+
+        state = self.decoder.decode(self.encoder.encode(match_state(match)))
+        self.encoder.ack(self.decoder.sequence)
+        return [state]
+
+    def close(self):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a Pong match from snapshots")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--room", default="bot-0", help="Room to spectate on the server")
+    parser.add_argument("--local", action="store_true", help="Watch an in-process CPU vs CPU match instead")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--position-step", type=int, default=1, help="Quantization for --local")
+    parser.add_argument("--velocity-step", type=int, default=1, help="Quantization for --local")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    pygame.display.set_caption("Pong Spectator")
+    clock = pygame.time.Clock()
+
+    game = Game(preload=False)
+    if args.local:
+        feed = LocalFeed(args.seed, args.position_step, args.velocity_step)
+    else:
+        feed = RemoteFeed((args.host, args.port), args.room)
+
+    snapshot_interval = 1 / TICK_RATE
+    last_snapshot_time = time.perf_counter()
+    stats_surface = None
+    next_stats_refresh = 0.0
+    running = True
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+
+        # == Snapshots ==
+        states = feed.poll()
+        now = time.perf_counter()
+        for state in states:
+            apply_state(game.match, state)
+        if states:
+            # The server sends less often when it's behind, so interpolate over the real spacing
+            snapshot_interval = max(1 / TICK_RATE, (now - last_snapshot_time) / len(states))
+            last_snapshot_time = now
+
+        # == Draw ==
+        alpha = min(1.0, (now - last_snapshot_time) / snapshot_interval)
+        game.draw(screen, alpha)
+        if now >= next_stats_refresh:
+            stats_surface = game.font_small.render(feed.stats.summary(TICK_RATE), True, (185, 185, 185))
+            next_stats_refresh = now + STATS_REFRESH
+        screen.blit(stats_surface, (10, 10))
+
+        pygame.display.flip()
+        clock.tick(TICK_RATE)
+
+    feed.close()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
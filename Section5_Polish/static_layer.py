@@ -0,0 +1,29 @@
+"""
+Static Layer Class
+
+Caches everything that doesn't move in a state as one pre-composited surface.
+
+- Built once per (state, resolution) key by calling a draw function.
+- Rebuilt only when the key changes, e.g. switching from menu to game.
+- Drawing a frame then starts with a single full-screen blit instead of
+  filling, drawing the centre line and rendering helper text every frame.
+"""
+
+import pygame
+
+class StaticLayer:
+    def __init__(self):
+        self.surface = None
+        self.key = None
+        self.builds = 0   # How many times the layer has been rebuilt
+
+    def get(self, key, size, draw_function):
+        if self.surface is None or key != self.key:
+            self.surface = pygame.Surface(size).convert()
+            draw_function(self.surface)
+            self.key = key
+            self.builds += 1
+        return self.surface
+
+    def invalidate(self):
+        self.surface = None
@@ -0,0 +1,57 @@
+"""
+Text Cache Class
+
+Caches rendered text surfaces so each string is only rasterised once.
+
+- Surfaces are keyed on (font, text, color, antialias).
+- Static strings ("First to 3 Wins", "[1] Menu") render once and are reused.
+- Dynamic strings (scores, speeds) only re-render when their value changes.
+- Least recently used entries are evicted once max_entries is reached.
+- hits / misses counters show how well the cache is doing; Game publishes
+  them to the profiler, so they show on the F3 overlay.
+- antialias sets the default for render(); the frame pacing controller turns
+  it off at lower quality levels so new strings are cheaper to rasterise.
+"""
+
+from collections import OrderedDict
+
+class TextCache:
+    def __init__(self, max_entries=128, antialias=True):
+        self.max_entries = max_entries
+        self.antialias = antialias
+        self.surfaces = OrderedDict()
+
+        # == Stats ==
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=None):
+        if antialias is None:
+            antialias = self.antialias
+        key = (font, text, tuple(color), antialias)
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+
+        # Evict the least recently used surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats_text(self):
+        return f"{self.hits} hits / {self.misses} misses ({len(self.surfaces)} cached)"
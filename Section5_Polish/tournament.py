@@ -0,0 +1,238 @@
+"""
+Tournament Runner
+
+Round-robin tournaments between CPU configurations, run headless on every core.
+
+- Each entrant is a named AI configuration (strategy, paddle speed, reaction
+  delay, aim error). Every pair plays --games matches, swapping sides each game.
+- The left paddle is driven by the same OpponentBody code as the CPU (BotPlayerBody),
+  so both sides play by identical rules; no window, audio or input is involved.
+- Matches are spread over a ProcessPoolExecutor in small batches so every core
+  stays busy, and each result is appended to the results file as it arrives.
+- The intercept table (table entrants) is built in the parent before the
+  pool starts; workers only memory-map the finished file.
+- Results are fixed-size binary records (18 bytes a game); read_results() reads them back.
+- Elo ratings are computed from the results in game order and printed at the end.
+- Two good CPUs can rally forever (the ball never speeds up), so a game still
+  level after --max-ticks is recorded as a draw.
+
+Usage:
+    python tournament.py --games 50 --win-score 5
+    python tournament.py --entrants entrants.json --workers 64 --results nightly.pongtrn
+
+An entrants file is a JSON object of name -> {"strategy", "speed", "reaction_delay", "aim_error"}.
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+from engine import Match, OpponentBody, Inputs, NO_INPUT, REPLAN_EVENTS
+
+MAGIC = b"PONGTRN1"
+RESULT = struct.Struct("<HHQBBI")   # left entrant, right entrant, seed, left score, right score, ticks
+NAME_COUNT = struct.Struct("<H")
+
+START = Inputs(presses=("2",))
+SERVE = Inputs(presses=("space",))
+
+DEFAULT_ENTRANTS = {
+    "chase": {"strategy": "chase", "speed": 10, "reaction_delay": 0, "aim_error": 0},
+    "predict": {"strategy": "predict", "speed": 10, "reaction_delay": 6, "aim_error": 40},
+    "predict_fast": {"strategy": "predict", "speed": 13, "reaction_delay": 3, "aim_error": 15},
+    "predict_slow": {"strategy": "predict", "speed": 6, "reaction_delay": 18, "aim_error": 90},
+}
+
+ELO_START = 1500
+ELO_K = 16
+
+class BotPlayerBody(OpponentBody):
+    """CPU-controlled left paddle: takes the player's place in a Match and ignores inputs."""
+    def __init__(self, match, entrant, seed):
+        player = match.player
+        super().__init__(
+            starting_x_position = player.rect.centerx,
+            starting_y_position = player.rect.centery,
+            speed = entrant["speed"],
+            size = player.rect.size,
+            strategy = entrant["strategy"],
+            reaction_delay = entrant["reaction_delay"],
+            aim_error = entrant["aim_error"],
+            seed = seed,
+            intercept_table = match.opponent.intercept_table
+        )
+        self.ball = match.ball
+
+    def update(self, inputs):
+        super().update(self.ball)
+
+def play_match(left, right, seed, win_score, max_ticks, intercept_table=None):
+    """Play one headless match; returns (left score, right score, ticks)."""
+    match = Match(
+        seed = seed,
+        opponent_strategy = right["strategy"],
+        opponent_speed = right["speed"],
+        reaction_delay = right["reaction_delay"],
+        aim_error = right["aim_error"],
+        intercept_table = intercept_table,
+        win_score = win_score
+    )
+    bot = match.player = BotPlayerBody(match, left, ~seed & ((1 << 64) - 1))
+
+    def replan(event, match):
+        if event in REPLAN_EVENTS:
+            bot.replan = True
+    match.add_observer(replan)
+
+    match.step(START)
+    while match.game_state == "game" and match.tick < max_ticks:
+        match.step(NO_INPUT if match.ball.active else SERVE)
+    return match.player_score, match.opponent_score, match.tick
+
+# == Worker Process ==
+_intercept_table = None
+
+def _load_table():
+    # Each worker opens the table the parent built, once and read-only; it's memory-mapped, so the pages are shared
+    global _intercept_table
+    if _intercept_table is None:
+        from intercept_table import InterceptTable  # Needs NumPy, only load it when used
+        _intercept_table = InterceptTable(build_if_missing=False)
+    return _intercept_table
+
+def play_batch(entrants, games, win_score, max_ticks):
+    """Play a list of (left index, right index, seed) games in a worker process."""
+    results = []
+    for left, right, seed in games:
+        needs_table = "table" in (entrants[left]["strategy"], entrants[right]["strategy"])
+        scores = play_match(entrants[left], entrants[right], seed, win_score, max_ticks,
+                            _load_table() if needs_table else None)
+        results.append((left, right, seed) + scores)
+    return results
+
+# == Scheduling ==
+def schedule(entrant_count, games, seed):
+    """Every round-robin game as (left, right, seed), alternating sides."""
+    games_list = []
+    for a, b in combinations(range(entrant_count), 2):
+        for game in range(games):
+            left, right = (a, b) if game % 2 == 0 else (b, a)
+            games_list.append((left, right, seed + len(games_list)))
+    return games_list
+
+def run_tournament(entrants, games=20, win_score=3, max_ticks=7200, workers=None,
+                   results_path="tournament.pongtrn", seed=0, batch_size=8):
+    """Play the whole round robin and stream every result to results_path."""
+    names = list(entrants)
+    configs = [entrants[name] for name in names]
+    games_list = schedule(len(names), games, seed)
+    batches = [games_list[index:index + batch_size] for index in range(0, len(games_list), batch_size)]
+
+    if any(config["strategy"] == "table" for config in configs):
+        # Build the table here if it's missing, so workers never race to create it
+        from intercept_table import InterceptTable
+        InterceptTable()
+
+    with open(results_path, "wb") as file, ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        file.write(MAGIC + NAME_COUNT.pack(len(names)))
+        for name in names:
+            encoded = name.encode()
+            file.write(bytes((len(encoded),)) + encoded)
+
+        futures = [executor.submit(play_batch, configs, batch, win_score, max_ticks) for batch in batches]
+        results = []
+        for future in as_completed(futures):
+            for result in future.result():
+                file.write(RESULT.pack(*result))
+                results.append(result)
+            file.flush()
+
+    return names, results
+
+def read_results(path):
+    """(entrant names, list of (left, right, seed, left score, right score, ticks))."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a tournament results file")
+
+    offset = len(MAGIC)
+    count, = NAME_COUNT.unpack_from(data, offset)
+    offset += NAME_COUNT.size
+    names = []
+    for _ in range(count):
+        length = data[offset]
+        names.append(data[offset + 1:offset + 1 + length].decode())
+        offset += 1 + length
+    return names, list(RESULT.iter_unpack(data[offset:offset + (len(data) - offset) // RESULT.size * RESULT.size]))
+
+# == Ratings ==
+def elo_ratings(names, results, k=ELO_K):
+    """Elo ratings from the results, replayed in seed order so they don't depend on which worker finished first."""
+    ratings = [ELO_START] * len(names)
+    for left, right, _, left_score, right_score, _ in sorted(results, key=lambda result: result[2]):
+        expected = 1 / (1 + 10 ** ((ratings[right] - ratings[left]) / 400))
+        actual = 1.0 if left_score > right_score else 0.0 if left_score < right_score else 0.5
+        ratings[left] += k * (actual - expected)
+        ratings[right] -= k * (actual - expected)
+    return dict(zip(names, ratings))
+
+def records(names, results):
+    """name -> [wins, losses, draws]"""
+    table = {name: [0, 0, 0] for name in names}
+    for left, right, _, left_score, right_score, _ in results:
+        if left_score == right_score:
+            table[names[left]][2] += 1
+            table[names[right]][2] += 1
+        else:
+            winner, loser = (left, right) if left_score > right_score else (right, left)
+            table[names[winner]][0] += 1
+            table[names[loser]][1] += 1
+    return table
+
+def print_standings(names, results):
+    ratings = elo_ratings(names, results)
+    table = records(names, results)
+    print(f"{'entrant':<16} {'elo':>6} {'won':>5} {'lost':>5} {'drawn':>5}")
+    for name in sorted(names, key=ratings.get, reverse=True):
+        wins, losses, draws = table[name]
+        print(f"{name:<16} {ratings[name]:>6.0f} {wins:>5} {losses:>5} {draws:>5}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament between CPU configurations")
+    parser.add_argument("--entrants", help="JSON file of name -> AI settings (default: built-in set)")
+    parser.add_argument("--tiers", action="store_true", help="Add the intercept_table difficulty tiers as entrants")
+    parser.add_argument("--games", type=int, default=20, help="Games per pairing (sides alternate)")
+    parser.add_argument("--win-score", type=int, default=3, help="Points needed to win a game")
+    parser.add_argument("--max-ticks", type=int, default=7200, help="Ticks before a game is called a draw (7200 = 2 minutes)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Games per task sent to a worker")
+    parser.add_argument("--results", default="tournament.pongtrn", help="Results file to write")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game")
+    args = parser.parse_args()
+
+    if args.entrants:
+        with open(args.entrants) as file:
+            entrants = json.load(file)
+    else:
+        entrants = dict(DEFAULT_ENTRANTS)
+    if args.tiers:
+        from intercept_table import DIFFICULTY_TIERS
+        for tier, (speed, reaction_delay, aim_error) in DIFFICULTY_TIERS.items():
+            entrants[tier] = {"strategy": "table", "speed": speed, "reaction_delay": reaction_delay, "aim_error": aim_error}
+
+    start = time.perf_counter()
+    names, results = run_tournament(
+        entrants, args.games, args.win_score, args.max_ticks, args.workers,
+        args.results, args.seed, args.batch_size
+    )
+    elapsed = time.perf_counter() - start
+    ticks = sum(result[5] for result in results)
+    print(f"{len(results)} games, {ticks} ticks in {elapsed:.1f}s ({ticks / elapsed:,.0f} ticks/s) -> {args.results}")
+    print_standings(names, results)
+
+if __name__ == "__main__":
+    main()